@@ -7,7 +7,6 @@ import tempfile
 import typing as t
 
 import click
-import requests
 import yaml
 from aiida.cmdline.params import options as options_core
 from aiida.cmdline.utils import decorators, echo
@@ -62,40 +61,92 @@ def cmd_install_family(archive, label, description, archive_format, family_type,
     however, that not all values are accepted. For example, the `pseudo.family.sssp` and `pseudo.family.pseudo_dojo` are
     blacklisted since they have their own dedicated commands in `install sssp` and `install pseudo-dojo`, respectively.
     """
-    from .utils import attempt, create_family_from_archive
+    from .utils import attempt, create_family_from_archive, create_family_from_tar_stream
 
-    if isinstance(archive, pathlib.Path) and archive.is_dir():
+    # If the ``archive`` was specified as a URL, the ``PathOrUrl`` parameter type will already have downloaded its
+    # content to a temporary file, so at this point it is always a path on the local file system. Tar archives are
+    # parsed straight from the file, any other format is first unpacked to a temporary directory.
+    if archive.is_dir():
         with attempt(f'creating a pseudopotential family from directory `{archive}`...', include_traceback=traceback):
             family = family_type.create_from_folder(archive, label, pseudo_type=pseudo_type)
-    elif isinstance(archive, pathlib.Path) and archive.is_file():
+    elif archive_format in ('tar', 'gztar', 'bztar', 'xztar') or (
+        archive_format is None and tarfile.is_tarfile(archive)
+    ):
+        with attempt('parsing pseudos from archive... ', include_traceback=traceback):
+            with archive.open('rb') as handle:
+                family = create_family_from_tar_stream(family_type, label, handle, pseudo_type=pseudo_type)
+    else:
         with attempt('unpacking archive and parsing pseudos... ', include_traceback=traceback):
             family = create_family_from_archive(
                 family_type, label, archive, fmt=archive_format, pseudo_type=pseudo_type
             )
-    else:
-        # At this point, we can assume that it is not a valid filepath on disk, but rather a URL and the ``archive``
-        # variable will contain the result objects from the ``requests`` library. The validation of the URL will already
-        # have been done by the ``PathOrUrl`` parameter type and will already have retrieved the content. The content of
-        # the URL must be copied to a local temporary file because `create_family_from_archive` does currently not
-        # accept filelike objects, because in turn the underlying `shutil.unpack_archive` does not.
-        with tempfile.NamedTemporaryFile(mode='w+b') as handle:
-            handle.write(archive.content)
-            handle.flush()
-
-            with attempt('unpacking archive and parsing pseudos... ', include_traceback=traceback):
-                family = create_family_from_archive(
-                    family_type, label, pathlib.Path(handle.name), fmt=archive_format, pseudo_type=pseudo_type
-                )
 
     family.description = description
     echo.echo_success(f'installed `{label}` containing {family.count()} pseudopotentials')
 
 
+def write_download_archive(tarball_path: pathlib.Path, filepaths: t.Sequence[pathlib.Path]) -> None:
+    """Write the files of a ``--download-only`` invocation to a tarball.
+
+    The tarball is first written to a sibling ``.part`` file that is only renamed to ``tarball_path`` once complete.
+    This way an interrupted command never leaves a truncated archive behind that would be rejected as already existing.
+    If writing the tarball fails, the ``.part`` file is removed.
+
+    :param tarball_path: the filepath of the tarball to write.
+    :param filepaths: the filepaths to add to the tarball, which are added under their filename.
+    """
+    filepath_partial = tarball_path.with_name(f'{tarball_path.name}.part')
+
+    try:
+        with tarfile.open(filepath_partial, 'w') as handle:
+            for filepath in filepaths:
+                handle.add(filepath, filepath.name)
+
+        filepath_partial.replace(tarball_path)
+    finally:
+        filepath_partial.unlink(missing_ok=True)
+
+
+def get_patch_version(content: bytes, version: str) -> str:
+    """Return the latest patch version of a minor version from the content of the SSSP ``versions.yaml`` file.
+
+    The YAML document is processed as a stream of parsing events, and the iteration stops as soon as the value of the
+    requested minor version is encountered, such that the full mapping never has to be constructed.
+
+    :param content: the raw content of the ``versions.yaml`` file.
+    :param version: the minor version for which to return the latest patch version.
+    :return: the latest patch version.
+    :raises KeyError: if the minor version is not defined in the top-level mapping of the document.
+    """
+    loader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+    depth = 0
+    expect_key = True
+    key_matches = False
+
+    for event in yaml.parse(content, Loader=loader):
+        if isinstance(event, yaml.CollectionStartEvent):
+            depth += 1
+        elif isinstance(event, yaml.CollectionEndEvent):
+            depth -= 1
+            # A nested collection was the value of a top-level key, so the next top-level scalar is a key again.
+            if depth == 1:
+                expect_key = True
+        elif isinstance(event, yaml.ScalarEvent) and depth == 1:
+            if expect_key:
+                key_matches = event.value == version
+            elif key_matches:
+                return event.value
+            expect_key = not expect_key
+
+    raise KeyError(version)
+
+
 def download_sssp(
     configuration: 'SsspConfiguration',
     filepath_archive: pathlib.Path,
     filepath_metadata: pathlib.Path,
     traceback: bool = False,
+    cache: bool = True,
 ) -> str:
     """Download the pseudopotential archive and metadata for an SSSP configuration to a path on disk.
 
@@ -103,11 +154,12 @@ def download_sssp(
     :param filepath_archive: absolute filepath to write the pseudopotential archive to.
     :param filepath_metadata: absolute filepath to write the metadata file to.
     :param traceback: boolean, if true, print the traceback when an exception occurs.
+    :param cache: boolean, if true, use the download cache for the archive and metadata.
     :return: Latest patch version of the requested minor version
     """
     from aiida_pseudo.groups.family import SsspFamily
 
-    from .utils import attempt
+    from .utils import attempt, download, get_session
 
     # The ``parent_id=19`` points to the SSSP entry on the Materials Cloud. Using ``parent_id`` will fetch the latest
     # version of the SSSP archive record.
@@ -117,11 +169,10 @@ def download_sssp(
     # releases of the SSSP only contain bug fixes, there is no reason to have the user install an outdated patch
     # version. So, the latest patch version of the minor version that is specified by the user is always installed.
     with attempt('downloading patch versions information... ', include_traceback=traceback):
-        response = requests.get(url_template.format(filename='versions.yaml'), timeout=30)
+        response = get_session().get(url_template.format(filename='versions.yaml'), timeout=30)
         response.raise_for_status()
-        # The `version_mapping` is a dictionary that maps each minor version (key) to the latest patch version (value)
-        version_mapping = yaml.load(response.content, Loader=yaml.SafeLoader)
-        patch_version = version_mapping[configuration.version]
+        # The document is a mapping of each minor version (key) to the latest patch version (value)
+        patch_version = get_patch_version(response.content, configuration.version)
 
     echo.echo_info(f'Latest patch version found: {patch_version}')
 
@@ -132,18 +183,10 @@ def download_sssp(
     url_metadata = url_template.format(filename=metadata_filename)
 
     with attempt('downloading selected pseudopotentials archive... ', include_traceback=traceback):
-        response = requests.get(url_archive, timeout=30)
-        response.raise_for_status()
-        with open(filepath_archive, 'wb') as handle:
-            handle.write(response.content)
-            handle.flush()
+        download(url_archive, filepath_archive, cache=cache, timeout=30)
 
     with attempt('downloading selected pseudopotentials metadata... ', include_traceback=traceback):
-        response = requests.get(url_metadata, timeout=30)
-        response.raise_for_status()
-        with open(filepath_metadata, 'wb') as handle:
-            handle.write(response.content)
-            handle.flush()
+        download(url_metadata, filepath_metadata, cache=cache, timeout=30)
 
     return patch_version
 
@@ -175,9 +218,16 @@ def install_sssp(
         family = create_family_from_archive(SsspFamily, label, filepath_archive)
 
     cutoffs = {}
+    pseudos = family.pseudos
 
     for element, values in metadata.items():
-        if family.get_pseudo(element).md5 != values['md5']:
+        pseudo = pseudos.get(element)
+
+        if pseudo is None:
+            Group.collection.delete(family.pk)
+            echo.echo_critical(f'archive does not contain a pseudo for element {element} that is defined in metadata')
+
+        if pseudo.md5 != values['md5']:
             Group.collection.delete(family.pk)
             msg = f"md5 of pseudo for element {element} does not match that of the metadata {values['md5']}"
             echo.echo_critical(msg)
@@ -196,8 +246,9 @@ def install_sssp(
 @options.PROTOCOL(type=click.Choice(['efficiency', 'precision']), default='efficiency', show_default=True)
 @options.DOWNLOAD_ONLY()
 @options.FROM_DOWNLOAD()
+@options.NO_CACHE()
 @options.TRACEBACK()
-def cmd_install_sssp(version, functional, protocol, download_only, from_download, traceback):
+def cmd_install_sssp(version, functional, protocol, download_only, from_download, no_cache, traceback):
     """Install an SSSP configuration.
 
     The SSSP configuration will be automatically downloaded from the Materials Cloud Archive entry to create a new
@@ -212,6 +263,8 @@ def cmd_install_sssp(version, functional, protocol, download_only, from_download
     from aiida_pseudo import __version__
     from aiida_pseudo.groups.family.sssp import SsspConfiguration, SsspFamily
 
+    from .utils import unpack_archive
+
     if download_only and from_download is not None:
         raise click.BadParameter(
             'cannot specify both `--download-only` and `--from-download`.',
@@ -224,7 +277,9 @@ def cmd_install_sssp(version, functional, protocol, download_only, from_download
     if configuration not in SsspFamily.valid_configurations:
         echo.echo_critical(f'{version} {functional} {protocol} is not a valid SSSP configuration')
 
-    with tempfile.TemporaryDirectory() as tmppath:
+    # With ``--download-only`` the files are staged in the working directory, where the final archive is written, such
+    # that the archive does not have to be written across a filesystem boundary.
+    with tempfile.TemporaryDirectory(dir=pathlib.Path.cwd() if download_only else None) as tmppath:
         dirpath = pathlib.Path(tmppath)
 
         filepath_archive = dirpath / 'archive.tar.gz'
@@ -237,22 +292,19 @@ def cmd_install_sssp(version, functional, protocol, download_only, from_download
             if tarball_path.exists():
                 echo.echo_critical(f'the file `{tarball_path}` already exists.')
 
-            download_sssp(configuration, filepath_archive, filepath_metadata, traceback)
+            download_sssp(configuration, filepath_archive, filepath_metadata, traceback, cache=not no_cache)
 
             with filepath_configuration.open('w') as handle:
                 handle.write(json.dumps(configuration._asdict()))
 
-            with tarfile.open(tarball_path, 'w') as tarball_file:
-                for filepath in [filepath_configuration, filepath_metadata, filepath_archive]:
-                    tarball_file.add(filepath, filepath.name)
+            write_download_archive(tarball_path, (filepath_configuration, filepath_metadata, filepath_archive))
 
             echo.echo_success(f'Pseudopotential archive written to: {tarball_path.name}')
             return
 
         if from_download is not None:
             tarball_path = pathlib.Path(from_download).absolute()
-            with tarfile.open(tarball_path, 'r') as handle:
-                handle.extractall(dirpath)
+            unpack_archive(tarball_path, dirpath, fmt='tar')
 
             for filepath in (filepath_archive, filepath_metadata, filepath_configuration):
                 if not filepath.exists():
@@ -280,7 +332,7 @@ def cmd_install_sssp(version, functional, protocol, download_only, from_download
             sys.exit(1)
 
         if not from_download:
-            download_sssp(configuration, filepath_archive, filepath_metadata, traceback)
+            download_sssp(configuration, filepath_archive, filepath_metadata, traceback, cache=not no_cache)
 
         description = (
             f'SSSP v{configuration.version} {configuration.functional} {configuration.protocol} '
@@ -297,6 +349,7 @@ def download_pseudo_dojo(
     filepath_archive: pathlib.Path,
     filepath_metadata: pathlib.Path,
     traceback: bool = False,
+    cache: bool = True,
 ) -> None:
     """Download the pseudopotential archive and metadata for a PseudoDojo configuration to a path on disk.
 
@@ -304,27 +357,20 @@ def download_pseudo_dojo(
     :param filepath_archive: absolute filepath to write the pseudopotential archive to.
     :param filepath_metadata: absolute filepath to write the metadata archive to.
     :param traceback: boolean, if true, print the traceback when an exception occurs.
+    :param cache: boolean, if true, use the download cache for the archive and metadata.
     """
     from ..groups.family.pseudo_dojo import PseudoDojoFamily
-    from .utils import attempt
+    from .utils import attempt, download
 
     label = PseudoDojoFamily.format_configuration_label(configuration)
     url_archive = PseudoDojoFamily.get_url_archive(label)
     url_metadata = PseudoDojoFamily.get_url_metadata(label)
 
     with attempt('downloading selected pseudopotentials archive... ', include_traceback=traceback):
-        response = requests.get(url_archive, timeout=30, verify=False)
-        response.raise_for_status()
-        with open(filepath_archive, 'wb') as handle:
-            handle.write(response.content)
-            handle.flush()
+        download(url_archive, filepath_archive, cache=cache, timeout=30, verify=False)
 
     with attempt('downloading selected pseudopotentials metadata archive... ', include_traceback=traceback):
-        response = requests.get(url_metadata, timeout=30, verify=False)
-        response.raise_for_status()
-        with open(filepath_metadata, 'wb') as handle:
-            handle.write(response.content)
-            handle.flush()
+        download(url_metadata, filepath_metadata, cache=cache, timeout=30, verify=False)
 
 
 def install_pseudo_dojo(
@@ -335,6 +381,7 @@ def install_pseudo_dojo(
     label: str,
     description: str = '',
     traceback: bool = False,
+    default_stringency: t.Optional[str] = None,
 ) -> 'PseudoDojoFamily':
     """Install the ``PseudoDojoFamily`` and set the recommended cutoffs.
 
@@ -344,8 +391,10 @@ def install_pseudo_dojo(
     :pseudo_type: type of the pseudopotentials (psp8, upf, ...).
     :param description: description of the pseudopotential family group.
     :param traceback: boolean, if true, print the traceback when an exception occurs.
+    :param default_stringency: optional stringency to set as the default of the family.
     """
 
+    from aiida.manage import get_manager
     from aiida.orm import Group
 
     from aiida_pseudo.groups.family.pseudo_dojo import PseudoDojoConfiguration, PseudoDojoFamily
@@ -358,8 +407,16 @@ def install_pseudo_dojo(
     with attempt('unpacking metadata archive and parsing metadata...', include_traceback=traceback):
         md5s, cutoffs = PseudoDojoFamily.parse_djrepos_from_archive(filepath_metadata, pseudo_type=pseudo_type)
 
+    pseudos = family.pseudos
+
     for element, md5 in md5s.items():
-        if family.get_pseudo(element).md5 != md5:
+        pseudo = pseudos.get(element)
+
+        if pseudo is None:
+            Group.collection.delete(family.pk)
+            echo.echo_critical(f'archive does not contain a pseudo for element {element} that is defined in metadata')
+
+        if pseudo.md5 != md5:
             Group.collection.delete(family.pk)
             msg = f'md5 of pseudo for element {element} does not match that of the metadata {md5}'
             echo.echo_critical(msg)
@@ -379,14 +436,18 @@ def install_pseudo_dojo(
     if configuration in paw_configurations:
         adjusted_cutoffs = {}
         for stringency, str_cutoffs in cutoffs.items():
-            adjusted_cutoffs[stringency] = []
-            max_cutoff_wfc = max(cutoffs['cutoff_wfc'] for cutoffs in str_cutoffs.values())
-            filler_cutoff_wfc = max_cutoff_wfc * 1.5
-            for element, cutoff in str_cutoffs.items():
-                if cutoff['cutoff_wfc'] <= 0:
-                    cutoffs[stringency][element]['cutoff_wfc'] = filler_cutoff_wfc
-                    cutoffs[stringency][element]['cutoff_rho'] = 2.0 * filler_cutoff_wfc
-                    adjusted_cutoffs[stringency].append(element)
+            elements = [element for element, cutoff in str_cutoffs.items() if cutoff['cutoff_wfc'] <= 0]
+
+            if not elements:
+                continue
+
+            adjusted_cutoffs[stringency] = elements
+            filler_cutoff_wfc = 1.5 * max(cutoff['cutoff_wfc'] for cutoff in str_cutoffs.values())
+
+            for element in elements:
+                cutoff = str_cutoffs[element]
+                cutoff['cutoff_wfc'] = filler_cutoff_wfc
+                cutoff['cutoff_rho'] = 2.0 * filler_cutoff_wfc
 
         for stringency, elements in adjusted_cutoffs.items():
             msg = (
@@ -396,9 +457,13 @@ def install_pseudo_dojo(
             )
             echo.echo_warning(msg)
 
-    family.description = description
-    for stringency, cutoff_values in cutoffs.items():
-        family.set_cutoffs(cutoff_values, stringency, unit='Eh')
+    # Set all the metadata in a single transaction, such that it is committed to the database once instead of per extra.
+    with get_manager().get_profile_storage().transaction():
+        family.description = description
+        for stringency, cutoff_values in cutoffs.items():
+            family.set_cutoffs(cutoff_values, stringency, unit='Eh')
+        if default_stringency is not None:
+            family.set_default_stringency(default_stringency)
 
     echo.echo_success(f'installed `{label}` containing {family.count()} pseudopotentials.')
 
@@ -414,6 +479,7 @@ def install_pseudo_dojo(
 @options.DEFAULT_STRINGENCY(type=click.Choice(['low', 'normal', 'high']), default='normal', show_default=True)
 @options.DOWNLOAD_ONLY()
 @options.FROM_DOWNLOAD()
+@options.NO_CACHE()
 @options.TRACEBACK()
 def cmd_install_pseudo_dojo(
     version,
@@ -424,6 +490,7 @@ def cmd_install_pseudo_dojo(
     default_stringency,
     download_only,
     from_download,
+    no_cache,
     traceback,
 ):
     """Install a PseudoDojo configuration.
@@ -441,6 +508,8 @@ def cmd_install_pseudo_dojo(
     from aiida_pseudo.data.pseudo import JthXmlData, PsmlData, Psp8Data, UpfData
     from aiida_pseudo.groups.family.pseudo_dojo import PseudoDojoConfiguration, PseudoDojoFamily
 
+    from .utils import unpack_archive
+
     if download_only and from_download is not None:
         raise click.BadParameter(
             'cannot specify both `--download-only` and `--from-download`.',
@@ -461,7 +530,9 @@ def cmd_install_pseudo_dojo(
     if configuration not in PseudoDojoFamily.valid_configurations:
         echo.echo_critical(f'{configuration} is not a valid configuration')
 
-    with tempfile.TemporaryDirectory() as tmppath:
+    # With ``--download-only`` the files are staged in the working directory, where the final archive is written, such
+    # that the archive does not have to be written across a filesystem boundary.
+    with tempfile.TemporaryDirectory(dir=pathlib.Path.cwd() if download_only else None) as tmppath:
         dirpath = pathlib.Path(tmppath)
 
         filepath_archive = dirpath / 'archive.tgz'
@@ -474,22 +545,19 @@ def cmd_install_pseudo_dojo(
             if tarball_path.exists():
                 echo.echo_critical(f'the file `{tarball_path}` already exists.')
 
-            download_pseudo_dojo(configuration, filepath_archive, filepath_metadata, traceback)
+            download_pseudo_dojo(configuration, filepath_archive, filepath_metadata, traceback, cache=not no_cache)
 
             with filepath_configuration.open('w') as handle:
                 handle.write(json.dumps(configuration._asdict()))
 
-            with tarfile.open(tarball_path, 'w') as tarball_file:
-                for filepath in [filepath_configuration, filepath_metadata, filepath_archive]:
-                    tarball_file.add(filepath, filepath.name)
+            write_download_archive(tarball_path, (filepath_configuration, filepath_metadata, filepath_archive))
 
             echo.echo_success(f'Pseudopotential archive written to: {tarball_path.name}')
             return
 
         if from_download is not None:
             tarball_path = pathlib.Path(from_download).absolute()
-            with tarfile.open(tarball_path, 'r') as handle:
-                handle.extractall(dirpath)
+            unpack_archive(tarball_path, dirpath, fmt='tar')
 
             with filepath_configuration.open('r') as handle:
                 configuration = PseudoDojoConfiguration(**json.load(handle))
@@ -512,13 +580,19 @@ def cmd_install_pseudo_dojo(
             sys.exit(1)
 
         if not from_download:
-            download_pseudo_dojo(configuration, filepath_archive, filepath_metadata, traceback)
+            download_pseudo_dojo(configuration, filepath_archive, filepath_metadata, traceback, cache=not no_cache)
 
         description = f'{configuration} installed with aiida-pseudo v{__version__}'
         description += f'\nArchive pseudos md5: {md5_file(filepath_archive)}'
         description += f'\nPseudo metadata md5: {md5_file(filepath_metadata)}'
 
-        family = install_pseudo_dojo(
-            configuration, filepath_archive, filepath_metadata, pseudo_type, label, description, traceback
+        install_pseudo_dojo(
+            configuration,
+            filepath_archive,
+            filepath_metadata,
+            pseudo_type,
+            label,
+            description,
+            traceback,
+            default_stringency=default_stringency,
         )
-        family.set_default_stringency(default_stringency)
@@ -44,7 +44,7 @@ def cmd_list(project, raw, family_type):
     rows = []
 
     for (group,) in get_families_builder().iterall():
-        if family_type and family_type.entry_point != group.type_string:
+        if family_type and type(group) is not family_type:
             continue
 
         row = []
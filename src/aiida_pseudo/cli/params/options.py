@@ -24,6 +24,7 @@ __all__ = (
     'ARCHIVE_FORMAT',
     'UNIT',
     'DOWNLOAD_ONLY',
+    'NO_CACHE',
 )
 
 PROFILE = functools.partial(
@@ -133,3 +134,12 @@ FROM_DOWNLOAD = core_options.OverridableOption(
     required=False,
     help='Install the pseudpotential family from archive and metadata downloaded with the `--download-only` option.',
 )
+
+NO_CACHE = core_options.OverridableOption(
+    '--no-cache',
+    is_flag=True,
+    help=(
+        'Do not use the local cache of downloaded files, forcing the pseudopotential files to be downloaded again. The '
+        'cache is stored in the `aiida-pseudo` directory of `$XDG_CACHE_HOME`, or `~/.cache` if that is not defined.'
+    ),
+)
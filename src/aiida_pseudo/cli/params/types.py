@@ -1,17 +1,86 @@
 """Custom parameter types for command line interface commands."""
 from __future__ import annotations
 
+import bisect
+import functools
 import pathlib
 
 import click
-import requests
 from aiida.cmdline.params.types import GroupParamType
 
-from ..utils import attempt
+from ..utils import attempt, get_session
 
 __all__ = ('PseudoPotentialFamilyTypeParam', 'PseudoPotentialFamilyParam', 'PseudoPotentialTypeParam')
 
 
+@functools.lru_cache(maxsize=None)
+def _get_entry_point_names(group: str, prefix: str) -> tuple[str, ...]:
+    """Return the names of the entry points in the given group that start with the given prefix.
+
+    The result is cached since scanning the installed entry points is relatively expensive and the ``complete`` methods
+    of the parameter types are called for every shell completion.
+
+    :param group: the entry point group, e.g. ``aiida.data``.
+    :param prefix: the prefix that entry point names should start with.
+    :return: sorted tuple of entry point names.
+    """
+    from aiida.plugins.entry_point import get_entry_point_names
+
+    return tuple(sorted(name for name in get_entry_point_names(group) if name.startswith(prefix)))
+
+
+def _complete_entry_point_names(group: str, prefix: str, incomplete: str) -> list[tuple[str, str]]:
+    """Return the completions for an incomplete entry point name in the given group that start with the given prefix.
+
+    Since the entry point names are sorted, the names that start with ``incomplete`` form a contiguous range, whose
+    start is found through bisection.
+
+    :param group: the entry point group, e.g. ``aiida.data``.
+    :param prefix: the prefix that entry point names should start with.
+    :param incomplete: the incomplete value to complete.
+    :return: list of tuples of entry point names that start with ``incomplete`` and an empty description.
+    """
+    names = _get_entry_point_names(group, prefix)
+    completions = []
+
+    for name in names[bisect.bisect_left(names, incomplete) :]:
+        if not name.startswith(incomplete):
+            break
+        completions.append((name, ''))
+
+    return completions
+
+
+@functools.lru_cache(maxsize=128)
+def _data_factory(entry_point_name: str):
+    """Return the data plugin class for the given entry point name.
+
+    The result is cached since loading an entry point requires scanning the installed entry points.
+
+    :param entry_point_name: the entry point name of the data plugin.
+    :return: the data plugin class.
+    :raises aiida.common.exceptions.EntryPointError: if the entry point cannot be loaded.
+    """
+    from aiida.plugins import DataFactory
+
+    return DataFactory(entry_point_name)
+
+
+@functools.lru_cache(maxsize=128)
+def _group_factory(entry_point_name: str):
+    """Return the group plugin class for the given entry point name.
+
+    The result is cached since loading an entry point requires scanning the installed entry points.
+
+    :param entry_point_name: the entry point name of the group plugin.
+    :return: the group plugin class.
+    :raises aiida.common.exceptions.EntryPointError: if the entry point cannot be loaded.
+    """
+    from aiida.plugins import GroupFactory
+
+    return GroupFactory(entry_point_name)
+
+
 class PseudoPotentialTypeParam(click.ParamType):
     """Parameter type for ``click`` commands to define a subclass of ``PseudoPotentialData``."""
 
@@ -26,20 +95,17 @@ class PseudoPotentialTypeParam(click.ParamType):
             ``PseudoPotentialData``
         """
         from aiida.common import exceptions
-        from aiida.plugins import DataFactory
 
         from aiida_pseudo.data.pseudo import PseudoPotentialData
 
         try:
-            pseudo_type = DataFactory(value)
+            pseudo_type = _data_factory(value)
         except exceptions.EntryPointError as exception:
             raise click.BadParameter(f'`{value}` is not an existing data plugin.') from exception
 
         if not issubclass(pseudo_type, PseudoPotentialData):
             raise click.BadParameter(f'`{value}` entry point is not a subclass of `PseudoPotentialData`.')
 
-        PseudoPotentialData.entry_point = value
-
         return pseudo_type
 
     def complete(self, _, incomplete):
@@ -47,10 +113,7 @@ class PseudoPotentialTypeParam(click.ParamType):
 
         :returns: list of tuples of valid entry points (matching incomplete) and a description
         """
-        from aiida.plugins.entry_point import get_entry_point_names
-
-        entry_points = get_entry_point_names('aiida.data')
-        return [(ep, '') for ep in entry_points if (ep.startswith('pseudo') and ep.startswith(incomplete))]
+        return _complete_entry_point_names('aiida.data', 'pseudo', incomplete)
 
 
 class PseudoPotentialFamilyParam(GroupParamType):
@@ -102,12 +165,11 @@ class PseudoPotentialFamilyTypeParam(click.ParamType):
             `PseudoPotentialFamily``
         """
         from aiida.common import exceptions
-        from aiida.plugins import GroupFactory
 
         from aiida_pseudo.groups.family import PseudoPotentialFamily
 
         try:
-            family_type = GroupFactory(value)
+            family_type = _group_factory(value)
         except exceptions.EntryPointError as exception:
             raise click.BadParameter(f'`{value}` is not an existing group plugin.') from exception
 
@@ -117,8 +179,6 @@ class PseudoPotentialFamilyTypeParam(click.ParamType):
         if not issubclass(family_type, PseudoPotentialFamily):
             raise click.BadParameter(f'`{value}` entry point is not a subclass of `PseudoPotentialFamily`.')
 
-        PseudoPotentialFamily.entry_point = value
-
         return family_type
 
     def complete(self, _, incomplete):
@@ -126,10 +186,7 @@ class PseudoPotentialFamilyTypeParam(click.ParamType):
 
         :returns: list of tuples of valid entry points (matching incomplete) and a description
         """
-        from aiida.plugins.entry_point import get_entry_point_names
-
-        entry_points = get_entry_point_names('aiida.groups')
-        return [(ep, '') for ep in entry_points if (ep.startswith('pseudo.family') and ep.startswith(incomplete))]
+        return _complete_entry_point_names('aiida.groups', 'pseudo.family', incomplete)
 
 
 class PathOrUrl(click.Path):
@@ -137,23 +194,39 @@ class PathOrUrl(click.Path):
 
     name = 'PathOrUrl'
 
-    def convert(self, value, param, ctx) -> pathlib.Path | bytes:
+    def convert(self, value, param, ctx) -> pathlib.Path:
         """Convert the string value to the desired value.
 
         If the ``value`` corresponds to a valid path on the local filesystem, return it as a ``pathlib.Path`` instance.
-        Otherwise, treat it as a URL and try to fetch the content. If successful, the raw retrieved bytes will be
-        returned.
+        Otherwise, treat it as a URL and try to fetch the content. If successful, the content is streamed to a temporary
+        file, whose path is returned. The temporary file is removed once the context of the command is closed or, if
+        there is no context, when the interpreter exits.
 
         :param value: the filepath on the local filesystem or a URL.
         """
+        import atexit
+        import tempfile
+
         try:
             # Call the method of the super class, which will raise if it ``value`` is not a valid path.
             return pathlib.Path(super().convert(value, param, ctx))
         except click.exceptions.BadParameter:
             with attempt(f'attempting to download data from `{value}`...'):
-                response = requests.get(value, timeout=30)
-                response.raise_for_status()
-                return response
+                with tempfile.NamedTemporaryFile(delete=False) as handle:
+                    filepath = pathlib.Path(handle.name)
+                    ctx = ctx or click.get_current_context(silent=True)
+
+                    if ctx is not None:
+                        ctx.call_on_close(lambda: filepath.unlink(missing_ok=True))
+                    else:
+                        atexit.register(filepath.unlink, missing_ok=True)
+
+                    with get_session().get(value, timeout=30, stream=True) as response:
+                        response.raise_for_status()
+                        for chunk in response.iter_content(chunk_size=1 << 16):
+                            handle.write(chunk)
+
+                return filepath
 
 
 class UnitParamType(click.ParamType):
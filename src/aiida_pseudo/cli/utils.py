@@ -1,10 +1,20 @@
 """Command line interface utilities."""
+import functools
 from contextlib import contextmanager
 from pathlib import Path
 
 from aiida.cmdline.utils import echo
 
-__all__ = ('attempt', 'create_family_from_archive')
+__all__ = (
+    'attempt',
+    'create_family_from_archive',
+    'create_family_from_tar_stream',
+    'download',
+    'get_cache_dirpath',
+    'get_scratch_dirpath',
+    'get_session',
+    'unpack_archive',
+)
 
 
 @contextmanager
@@ -31,6 +41,182 @@ def attempt(message, exception_types=Exception, include_traceback=False):
         echo.echo(' [OK]', fg='green', bold=True)
 
 
+def get_cache_dirpath() -> Path:
+    """Return the directory in which downloaded files are cached.
+
+    The directory is ``aiida-pseudo`` in the user cache directory, which is ``$XDG_CACHE_HOME`` if defined and
+    ``~/.cache`` otherwise.
+    """
+    import os
+
+    return Path(os.environ.get('XDG_CACHE_HOME') or Path.home() / '.cache') / 'aiida-pseudo'
+
+
+def get_scratch_dirpath(size: int):
+    """Return a directory on a RAM-backed filesystem with enough free space to write ``size`` bytes, if any.
+
+    Temporary files that are written to such a directory, for example when unpacking an archive, never have to be
+    synced to disk. The candidates are ``/dev/shm`` and ``$XDG_RUNTIME_DIR``. If neither exists, is writable or has at
+    least three times the requested free space, ``None`` is returned, which instructs ``tempfile`` to use the default
+    temporary directory.
+
+    :param size: the number of bytes that are expected to be written.
+    :return: the directory or ``None``.
+    """
+    import os
+    import shutil
+
+    for dirpath in ('/dev/shm', os.environ.get('XDG_RUNTIME_DIR')):
+        if not dirpath or not os.path.isdir(dirpath) or not os.access(dirpath, os.W_OK):
+            continue
+
+        try:
+            if shutil.disk_usage(dirpath).free > 3 * size:
+                return dirpath
+        except OSError:
+            continue
+
+    return None
+
+
+@functools.lru_cache(maxsize=None)
+def get_session():
+    """Return the ``requests.Session`` that is shared by all HTTP requests of the command line interface.
+
+    Reusing a single session allows consecutive requests to the same host to reuse the open connection, instead of
+    establishing a new connection and performing the TLS handshake for each request.
+
+    :return: the ``requests.Session`` instance.
+    """
+    import requests
+
+    return requests.Session()
+
+
+def download(url: str, filepath: Path, cache: bool = True, **kwargs) -> None:
+    """Download the content of a URL to a file.
+
+    If ``cache`` is True and the server returns an ``ETag`` for the response, the content is stored in the download
+    cache. Subsequent downloads of the same URL send a conditional request, and if the server reports that the content
+    has not changed, the cached file is copied instead of downloading the content again.
+
+    The content is streamed to disk in chunks, such that it never has to be held in memory as a whole. The cached
+    content is stored in a file whose name is derived from the ``ETag``, which is written to a temporary file first and
+    then moved in place, and the ``ETag`` file that points to it is only updated last, in the same way. This guarantees
+    that an interrupted or concurrent download never leaves an ``ETag`` that points to incomplete or other content. If
+    the download cache cannot be written, for example because the file system is read-only, it is simply not used.
+
+    :param url: the URL to download.
+    :param filepath: the filepath to write the content to.
+    :param cache: boolean, if False, the download cache is neither read nor updated.
+    :param kwargs: keyword arguments that are passed to ``requests.Session.get``.
+    :raises requests.HTTPError: if the request failed.
+    """
+    import hashlib
+    import os
+    import shutil
+
+    import requests
+
+    def get_filepath_cache(etag: str) -> Path:
+        return dirpath_cache / f'{key}.{hashlib.sha256(etag.encode("utf-8")).hexdigest()}'
+
+    def write_content(response, filepath: Path) -> None:
+        with open(filepath, 'wb') as handle:
+            for chunk in response.iter_content(chunk_size=1024 * 1024):
+                handle.write(chunk)
+
+    dirpath_cache = get_cache_dirpath()
+    key = hashlib.sha256(url.encode('utf-8')).hexdigest()
+    filepath_etag = dirpath_cache / f'{key}.etag'
+    filepath_cache = None
+    etag_cached = None
+    headers = {}
+
+    if cache:
+        try:
+            etag_cached = filepath_etag.read_text(encoding='utf-8')
+        except OSError:
+            pass
+        else:
+            headers['If-None-Match'] = etag_cached
+
+    with get_session().get(url, headers=headers, stream=True, **kwargs) as response:
+        response.raise_for_status()
+
+        if response.status_code == requests.codes.not_modified:
+            etag = etag_cached
+            filepath_cache = get_filepath_cache(etag)
+        else:
+            etag = response.headers.get('ETag') if cache else None
+
+            if etag:
+                try:
+                    dirpath_cache.mkdir(parents=True, exist_ok=True)
+                except OSError:
+                    etag = None
+
+            if not etag:
+                write_content(response, filepath)
+                return
+
+            filepath_temp = dirpath_cache / f'{key}.{os.getpid()}.tmp'
+
+            try:
+                write_content(response, filepath_temp)
+                os.replace(filepath_temp, get_filepath_cache(etag))
+                filepath_temp.write_text(etag, encoding='utf-8')
+                os.replace(filepath_temp, filepath_etag)
+            except requests.RequestException:
+                raise
+            except OSError:
+                pass
+            else:
+                filepath_cache = get_filepath_cache(etag)
+            finally:
+                filepath_temp.unlink(missing_ok=True)
+
+    # If the cached content is missing or could not be written, the content is downloaded again without the cache, but
+    # only after the response of the first request has been closed.
+    if filepath_cache is None or not filepath_cache.is_file():
+        download(url, filepath, cache=False, **kwargs)
+        return
+
+    shutil.copyfile(filepath_cache, filepath)
+
+    if etag_cached is not None and etag_cached != etag:
+        get_filepath_cache(etag_cached).unlink(missing_ok=True)
+
+
+def unpack_archive(filepath_archive: Path, dirpath: Path, fmt=None) -> None:
+    """Unpack an archive into the given directory.
+
+    Tar archives, optionally compressed, are extracted directly with ``tarfile`` in streaming mode, using the ``data``
+    extraction filter if the Python version supports it. Any other format is delegated to ``shutil.unpack_archive``.
+
+    :param filepath_archive: absolute filepath to the archive.
+    :param dirpath: the directory to unpack the archive into.
+    :param fmt: the format of the archive, if not specified will attempt to guess based on extension of ``filepath``
+        and, if that fails, the content of the file.
+    :raises shutil.ReadError: if the archive could not be unpacked.
+    """
+    import shutil
+    import tarfile
+
+    if fmt in ('tar', 'gztar', 'bztar', 'xztar') or (
+        fmt is None and Path(filepath_archive).is_file() and tarfile.is_tarfile(filepath_archive)
+    ):
+        kwargs = {'filter': 'data'} if hasattr(tarfile, 'data_filter') else {}
+
+        try:
+            with tarfile.open(filepath_archive, 'r|*') as handle:
+                handle.extractall(dirpath, **kwargs)
+        except (OSError, tarfile.TarError) as exception:
+            raise shutil.ReadError(f'{filepath_archive} is not a valid tar archive: {exception}') from exception
+    else:
+        shutil.unpack_archive(filepath_archive, dirpath, format=fmt)
+
+
 def create_family_from_archive(cls, label, filepath_archive: Path, fmt=None, pseudo_type=None):
     """Construct a new pseudo family instance from a tar.gz archive.
 
@@ -49,9 +235,15 @@ def create_family_from_archive(cls, label, filepath_archive: Path, fmt=None, pse
     import shutil
     import tempfile
 
-    with tempfile.TemporaryDirectory() as dirpath:
+    # The archive is typically compressed, so the unpacked content can be several times larger than the archive itself.
+    if Path(filepath_archive).is_file():
+        dirpath_scratch = get_scratch_dirpath(5 * Path(filepath_archive).stat().st_size)
+    else:
+        dirpath_scratch = None
+
+    with tempfile.TemporaryDirectory(dir=dirpath_scratch) as dirpath:
         try:
-            shutil.unpack_archive(filepath_archive, dirpath, format=fmt)
+            unpack_archive(filepath_archive, dirpath, fmt=fmt)
         except shutil.ReadError as exception:
             raise OSError(f'failed to unpack the archive `{filepath_archive}`: {exception}') from exception
 
@@ -61,3 +253,31 @@ def create_family_from_archive(cls, label, filepath_archive: Path, fmt=None, pse
             raise OSError(f'failed to parse pseudos from `{dirpath}`: {exception}') from exception
 
     return family
+
+
+def create_family_from_tar_stream(cls, label, fileobj, pseudo_type=None):
+    """Construct a new pseudo family instance from a stream of a (compressed) tar archive.
+
+    The pseudo potentials are parsed straight from the members of the archive, without extracting them to disk.
+
+    .. warning:: the archive should not contain any subdirectories, but just the pseudo potential files.
+
+    :param cls: the pseudopotential family class to use, e.g. ``SsspFamily``
+    :param label: the label for the new family
+    :param fileobj: binary filelike object with the content of the (compressed) tar archive
+    :param pseudo_type: subclass of ``PseudoPotentialData`` to be used for the parsed pseudos. If not specified and
+        the family only defines a single supported pseudo type in ``_pseudo_types`` then that will be used otherwise
+        a ``ValueError`` is raised.
+    :return: newly created family
+    :raises OSError: if the archive could not be read or pseudos in it could not be parsed into a family
+    """
+    import tarfile
+
+    try:
+        family = cls.create_from_tar_stream(fileobj, label, pseudo_type=pseudo_type)
+    except tarfile.TarError as exception:
+        raise OSError(f'failed to unpack the archive: {exception}') from exception
+    except ValueError as exception:
+        raise OSError(f'failed to parse pseudos from the archive: {exception}') from exception
+
+    return family
@@ -3,7 +3,7 @@ import pathlib
 import re
 import typing
 
-from .pseudo import PseudoPotentialData
+from .pseudo import PseudoPotentialData, parse_xml_tag_attributes
 
 __all__ = ('JthXmlData',)
 
@@ -16,15 +16,20 @@ def parse_element(stream: typing.BinaryIO):
     :param stream: a filelike object with the binary content of the file.
     :return: the symbol of the element following the IUPAC naming standard.
     """
-    from xml.dom.minidom import parse
+    from xml.etree.ElementTree import ParseError
 
     try:
-        xml = parse(stream)
-        element = xml.getElementsByTagName('atom')[0].attributes['symbol'].value
-    except (AttributeError, IndexError, KeyError) as exception:
+        attributes = parse_xml_tag_attributes(stream, 'atom', ('symbol',))
+    except ParseError as exception:
         raise ValueError(f'could not parse the element from the XML content: {exception}') from exception
 
-    return element.capitalize()
+    if attributes is None:
+        raise ValueError('could not parse the element from the XML content: the `atom` tag is not defined.')
+
+    try:
+        return attributes['symbol'].capitalize()
+    except KeyError as exception:
+        raise ValueError(f'could not parse the element from the XML content: {exception}') from exception
 
 
 class JthXmlData(PseudoPotentialData):
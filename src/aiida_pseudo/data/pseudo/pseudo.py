@@ -1,8 +1,11 @@
 """Base class for data types representing pseudo potentials."""
 from __future__ import annotations
 
+import hashlib
 import io
+import os
 import pathlib
+import re
 import typing
 
 from aiida import orm, plugins
@@ -13,6 +16,92 @@ from aiida.orm.nodes.caching import NodeCaching
 
 __all__ = ('PseudoPotentialData',)
 
+ELEMENT_SYMBOLS = frozenset(values['symbol'] for values in elements.values())
+REGEX_XML_ATTRIBUTE = re.compile(r"""(?P<key>[\w:.-]+)\s*=\s*(?P<quote>['"])(?P<value>.*?)(?P=quote)""")
+
+
+def md5_from_stream(stream: typing.BinaryIO) -> str:
+    """Return the md5 checksum of the content of the stream from its current position.
+
+    If the stream is a ``BytesIO``, the checksum is computed directly from its underlying buffer, which avoids reading
+    the content in chunks that are copied into newly allocated ``bytes`` objects. Other file objects are passed to
+    ``hashlib.file_digest`` if available (Python 3.11 and up), which reads the content into a reusable buffer and
+    updates the checksum without going through the interpreter for each chunk.
+
+    The checksum is only used to identify the content and not for security purposes, which is declared to ``hashlib``
+    through ``usedforsecurity=False``, such that the implementation is also available on FIPS-restricted builds.
+
+    :param stream: a filelike object with the binary content of the file.
+    :return: the md5 checksum of the content.
+    """
+    if isinstance(stream, io.BytesIO):
+        with stream.getbuffer() as buffer:
+            return hashlib.md5(buffer[stream.tell() :], usedforsecurity=False).hexdigest()
+
+    if hasattr(hashlib, 'file_digest') and hasattr(stream, 'readinto') and hasattr(stream, 'readable'):
+        return hashlib.file_digest(stream, lambda: hashlib.md5(usedforsecurity=False)).hexdigest()
+
+    return md5_from_filelike(stream)
+
+
+def parse_xml_tag_attributes(stream: typing.BinaryIO, tag: str, required: typing.Sequence[str] = ()) -> dict | None:
+    """Return the attributes of the first element with the given tag in the XML content of the stream.
+
+    The element should be one of the first of the document, so first an attempt is made to find it with a regular
+    expression in the head of the content, which is a lot cheaper than parsing the XML. The result is only used if the
+    tag is not preceded by a comment, which could contain a commented out tag, and defines all ``required`` attributes
+    without any entity references, which would have to be unescaped. Otherwise, the content is parsed incrementally and
+    the parsing is stopped as soon as the tag is encountered, such that the rest of the document never has to be read.
+
+    :param stream: a filelike object with the binary content of the XML file.
+    :param tag: the name of the tag, without namespace prefix.
+    :param required: the attributes the tag has to define for the result of the regular expression to be used.
+    :return: dictionary with the attributes of the element or ``None`` if the content does not contain the tag.
+    :raises xml.etree.ElementTree.ParseError: if the content is not valid XML.
+    """
+    from xml.etree.ElementTree import iterparse
+
+    position = stream.tell()
+    head = stream.read(8192).decode('utf-8', errors='ignore')
+    match = re.search(rf"""<(?:[\w.-]+:)?{re.escape(tag)}\s(?P<attributes>(?:[^>'"]|"[^"]*"|'[^']*')*)>""", head)
+
+    if match and '<!--' not in head[: match.start()]:
+        attributes = {key: value for key, _, value in REGEX_XML_ATTRIBUTE.findall(match.group('attributes'))}
+
+        if all(key in attributes and '&' not in attributes[key] for key in required):
+            return attributes
+
+    stream.seek(position)
+
+    for _, node in iterparse(stream, events=('start',)):
+        if node.tag.rpartition('}')[2] == tag:
+            return node.attrib
+
+    return None
+
+
+def md5_from_directory(dirpath: typing.Union[str, pathlib.Path], max_workers: int | None = None) -> dict:
+    """Return the md5 checksums of all files in the given directory.
+
+    The files are hashed concurrently in a thread pool. This is effective because the hashing functions of ``hashlib``
+    release the GIL when processing large chunks of data, as does reading from files on disk. The checksums can be
+    passed to ``PseudoPotentialData.get_or_create`` such that they do not have to be computed sequentially.
+
+    :param dirpath: path to the directory.
+    :param max_workers: the maximum number of threads, by default determined by ``ThreadPoolExecutor``.
+    :return: dictionary mapping the path of each file in the directory onto its md5 checksum.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    def md5_from_filepath(filepath: pathlib.Path) -> str:
+        with filepath.open('rb') as handle:
+            return md5_from_stream(handle)
+
+    filepaths = [filepath for filepath in pathlib.Path(dirpath).iterdir() if filepath.is_file()]
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return dict(zip(filepaths, executor.map(md5_from_filepath, filepaths)))
+
 
 class PseudoPotentialDataCaching(NodeCaching):
     """Class to define caching behavior of ``PseudoPotentialData`` nodes."""
@@ -27,32 +116,43 @@ class PseudoPotentialData(plugins.DataFactory('core.singlefile')):
 
     _key_element = 'element'
     _key_md5 = 'md5'
+    _md5_computed = None
 
     _CLS_NODE_CACHING = PseudoPotentialDataCaching
 
     @classmethod
     def get_or_create(
-        cls, source: typing.Union[str, pathlib.Path, typing.BinaryIO], filename: typing.Optional[str] = None
+        cls,
+        source: typing.Union[str, pathlib.Path, typing.BinaryIO],
+        filename: typing.Optional[str] = None,
+        md5: typing.Optional[str] = None,
     ):
         """Get pseudopotenial data node from database with matching md5 checksum or create a new one if not existent.
 
         :param source: the source pseudopotential content, either a binary stream, or a ``str`` or ``Path`` to the path
             of the file on disk, which can be relative or absolute.
         :param filename: optional explicit filename to give to the file stored in the repository.
+        :param md5: optional md5 checksum of the content of ``source``, if it was already computed. If not specified, it
+            is computed from the ``source``. See ``md5_from_directory`` to compute the checksums of many files at once.
         :return: instance of ``PseudoPotentialData``, stored if taken from database, unstored otherwise.
         :raises TypeError: if the source is not a ``str``, ``pathlib.Path`` instance or binary stream.
         :raises FileNotFoundError: if the source is a filepath but does not exist.
         """
         source = cls.prepare_source(source)
 
+        if md5 is None:
+            md5 = md5_from_stream(source)
+
         query = orm.QueryBuilder()
-        query.append(cls, subclassing=False, filters={f'attributes.{cls._key_md5}': md5_from_filelike(source)})
+        query.append(cls, subclassing=False, filters={f'attributes.{cls._key_md5}': md5})
 
         pseudo = query.first(flat=True)
 
         if not pseudo:
             source.seek(0)
-            pseudo = cls(source, filename)
+            # The file is set separately from the constructor such that the checksum does not have to be computed again.
+            pseudo = cls(None)
+            pseudo.set_file(source, filename, md5=md5)
 
         return pseudo
 
@@ -60,12 +160,28 @@ class PseudoPotentialData(plugins.DataFactory('core.singlefile')):
     def get_entry_point_name(cls):
         """Return the entry point name associated with this data class.
 
+        .. note:: looking up the entry point requires iterating over all registered entry points, so a successful result
+            is cached on the class itself. The cache is read from the ``__dict__`` of the class such that a subclass
+            never inherits the cached entry point name of its parent class.
+
         :return: the entry point name.
+        :raises AttributeError: if the class is not registered as an entry point.
         """
         from aiida.plugins.entry_point import get_entry_point_from_class
 
+        try:
+            return cls.__dict__['_entry_point_name']
+        except KeyError:
+            pass
+
         _, entry_point = get_entry_point_from_class(cls.__module__, cls.__name__)
-        return entry_point.name
+
+        if entry_point is None:
+            raise AttributeError(f'the class `{cls.__name__}` is not registered as an entry point.')
+
+        cls._entry_point_name = entry_point.name
+
+        return cls._entry_point_name
 
     @staticmethod
     def is_readable_byte_stream(stream) -> bool:
@@ -74,8 +190,10 @@ class PseudoPotentialData(plugins.DataFactory('core.singlefile')):
         :param stream: the object to analyse.
         :returns: True if ``stream`` appears to be a readable filelike object in binary mode, False otherwise.
         """
-        return isinstance(stream, io.BytesIO) or (
-            hasattr(stream, 'read') and hasattr(stream, 'mode') and 'b' in stream.mode
+        # The binary stream base classes cover practically all streams and the check is a lot cheaper than inspecting
+        # the attributes of the stream, which is only done as a fallback for other filelike objects.
+        return isinstance(stream, (io.BufferedIOBase, io.RawIOBase)) or (
+            hasattr(stream, 'read') and 'b' in getattr(stream, 'mode', '')
         )
 
     @classmethod
@@ -87,17 +205,20 @@ class PseudoPotentialData(plugins.DataFactory('core.singlefile')):
         :raises TypeError: if the source is not a ``str``, ``pathlib.Path`` instance or binary stream.
         :raises FileNotFoundError: if the source is a filepath but does not exist.
         """
-        if not isinstance(source, (str, pathlib.Path)) and not cls.is_readable_byte_stream(source):
+        if isinstance(source, (str, pathlib.Path)):
+            # Reading the whole file allocates a single ``bytes`` object sized from the file size, which ``BytesIO``
+            # then shares instead of copying. Reading into a preallocated ``bytearray`` instead would double the peak
+            # memory because ``BytesIO`` does copy a ``bytearray``.
+            with open(source, 'rb') as handle:
+                stream = io.BytesIO(handle.read())
+                stream.name = os.path.basename(source)
+            return stream
+
+        if not cls.is_readable_byte_stream(source):
             raise TypeError(
                 f'`source` should be a `str` or `pathlib.Path` filepath on disk or a stream of bytes, got: {source}'
             )
 
-        if isinstance(source, (str, pathlib.Path)):
-            filename = pathlib.Path(source).name
-            with open(source, 'rb') as handle:
-                source = io.BytesIO(handle.read())
-                source.name = filename
-
         return source
 
     @classmethod
@@ -107,7 +228,7 @@ class PseudoPotentialData(plugins.DataFactory('core.singlefile')):
         :param element: the symbol of the element following the IUPAC naming standard.
         :raises ValueError: if the element symbol is invalid.
         """
-        if element not in [values['symbol'] for values in elements.values()]:
+        if element not in ELEMENT_SYMBOLS:
             raise ValueError(f'`{element}` is not a valid element.')
 
     def validate_md5(self, md5: str):
@@ -117,12 +238,16 @@ class PseudoPotentialData(plugins.DataFactory('core.singlefile')):
         :raises ValueError: if the md5 does not match that of the currently stored file.
         """
         with self.open(mode='rb') as handle:
-            md5_file = md5_from_filelike(handle)
+            md5_file = md5_from_stream(handle)
             if md5 != md5_file:
                 raise ValueError(f'md5 does not match that of stored file: {md5} != {md5_file}')
 
     def set_file(
-        self, source: typing.Union[str, pathlib.Path, typing.BinaryIO], filename: typing.Optional[str] = None, **kwargs
+        self,
+        source: typing.Union[str, pathlib.Path, typing.BinaryIO],
+        filename: typing.Optional[str] = None,
+        md5: typing.Optional[str] = None,
+        **kwargs,
     ):
         """Set the file content.
 
@@ -138,17 +263,31 @@ class PseudoPotentialData(plugins.DataFactory('core.singlefile')):
         :param source: the source pseudopotential content, either a binary stream, or a ``str`` or ``Path`` to the path
             of the file on disk, which can be relative or absolute.
         :param filename: optional explicit filename to give to the file stored in the repository.
+        :param md5: optional md5 checksum of the content of ``source``, if it was already computed. It is validated
+            against the content of the file when the node is stored. If not specified, it is computed from the
+            ``source``.
         :raises TypeError: if the source is not a ``str``, ``pathlib.Path`` instance or binary stream.
         :raises FileNotFoundError: if the source is a filepath but does not exist.
         """
         source = self.prepare_source(source)
         super().set_file(source, filename, **kwargs)
         source.seek(0)
-        self.md5 = md5_from_filelike(source)
+
+        # A checksum computed from the exact content that was just written to the repository does not have to be
+        # validated by reading the stored file again, as the ``md5`` setter would do, so it is recorded for ``store``.
+        if md5 is None:
+            md5 = self._md5_computed = md5_from_stream(source)
+        else:
+            self._md5_computed = None
+
+        self._set_md5_unchecked(md5)
 
     def store(self, **kwargs):
         """Store the node verifying first that all required attributes are set.
 
+        .. note:: the md5 checksum is only validated against the stored file if it is not the one that ``set_file``
+            computed from the content of the file itself.
+
         :raises :py:exc:`~aiida.common.StoringNotAllowed`: if no valid element has been defined.
         """
         try:
@@ -156,10 +295,11 @@ class PseudoPotentialData(plugins.DataFactory('core.singlefile')):
         except ValueError as exception:
             raise StoringNotAllowed('no valid element has been defined.') from exception
 
-        try:
-            self.validate_md5(self.md5)
-        except ValueError as exception:
-            raise StoringNotAllowed(exception) from exception
+        if self.md5 is None or self.md5 != self._md5_computed:
+            try:
+                self.validate_md5(self.md5)
+            except ValueError as exception:
+                raise StoringNotAllowed(exception) from exception
 
         return super().store(**kwargs)
 
@@ -179,6 +319,17 @@ class PseudoPotentialData(plugins.DataFactory('core.singlefile')):
         :raises ValueError: if the element symbol is invalid.
         """
         self.validate_element(value)
+        self._set_element_unchecked(value)
+
+    def _set_element_unchecked(self, value: str):
+        """Set the element without validating it.
+
+        .. warning:: this should only be used for values that are guaranteed to be valid element symbols, for example
+            because they were looked up from a parsed atomic number in ``aiida.common.constants.elements``, as is done
+            by ``Psp8Data`` and ``VpsData``.
+
+        :param value: the symbol of the element following the IUPAC naming standard.
+        """
         self.base.attributes.set(self._key_element, value)
 
     @property
@@ -197,4 +348,14 @@ class PseudoPotentialData(plugins.DataFactory('core.singlefile')):
         :raises ValueError: if the md5 does not match that of the currently stored file.
         """
         self.validate_md5(value)
+        self._set_md5_unchecked(value)
+
+    def _set_md5_unchecked(self, value: str):
+        """Set the md5 without validating it against the currently stored file.
+
+        .. warning:: this should only be used for a checksum that was computed from the exact content of the currently
+            stored file.
+
+        :param value: the md5 checksum.
+        """
         self.base.attributes.set(self._key_md5, value)
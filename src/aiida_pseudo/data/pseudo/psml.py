@@ -3,42 +3,57 @@ import pathlib
 import re
 import typing
 
-from .pseudo import PseudoPotentialData
+from .pseudo import PseudoPotentialData, parse_xml_tag_attributes
 
 __all__ = ('PsmlData',)
 
 REGEX_ELEMENT = re.compile(r"""\s*(?P<element>[a-zA-Z]{1}[a-z]?)\s+.*""")
+REQUIRED_ATTRIBUTES = ('atomic-label', 'z-pseudo')
 
 
-def parse_element(stream: typing.BinaryIO) -> str:
-    """Parse the content of the PSML file to determine the element.
+def _parse_pseudo_atom_spec(stream: typing.BinaryIO) -> dict:
+    """Parse the attributes of the ``pseudo-atom-spec`` tag from the content of the PSML file.
 
     :param stream: a filelike object with the binary content of the file.
-    :return: the symbol of the element following the IUPAC naming standard.
+    :return: dictionary with the attributes of the ``pseudo-atom-spec`` tag.
+    :raises ValueError: if the content is not valid XML or does not define the ``pseudo-atom-spec`` tag.
     """
-    from xml.dom.minidom import parse
+    from xml.etree.ElementTree import ParseError
 
     try:
-        xml = parse(stream)
-        element = xml.getElementsByTagName('pseudo-atom-spec')[0].attributes['atomic-label'].value
-    except (AttributeError, IndexError, KeyError) as exception:
+        attributes = parse_xml_tag_attributes(stream, 'pseudo-atom-spec', REQUIRED_ATTRIBUTES)
+    except ParseError as exception:
+        raise ValueError(f'could not parse the PSML content: {exception}') from exception
+
+    if attributes is None:
+        raise ValueError('could not parse the PSML content: the `pseudo-atom-spec` tag is not defined.')
+
+    return attributes
+
+
+def _get_element(attributes: dict) -> str:
+    """Return the element from the attributes of the ``pseudo-atom-spec`` tag.
+
+    :param attributes: dictionary with the attributes of the ``pseudo-atom-spec`` tag.
+    :return: the symbol of the element following the IUPAC naming standard.
+    """
+    try:
+        element = attributes['atomic-label']
+    except KeyError as exception:
         raise ValueError(f'could not parse the element from the PSML content: {exception}') from exception
 
     return element.capitalize()
 
 
-def parse_z_valence(stream: typing.BinaryIO) -> int:
-    """Parse the content of the PSML file to determine the Z valence.
+def _get_z_valence(attributes: dict) -> int:
+    """Return the Z valence from the attributes of the ``pseudo-atom-spec`` tag.
 
-    :param stream: a filelike object with the binary content of the file.
+    :param attributes: dictionary with the attributes of the ``pseudo-atom-spec`` tag.
     :return: the Z valence.
     """
-    from xml.dom.minidom import parse
-
     try:
-        xml = parse(stream)
-        z_valence = xml.getElementsByTagName('pseudo-atom-spec')[0].attributes['z-pseudo'].value
-    except (AttributeError, IndexError, KeyError) as exception:
+        z_valence = attributes['z-pseudo']
+    except KeyError as exception:
         raise ValueError(f'could not parse the Z valence from the PSML content: {exception}') from exception
 
     try:
@@ -46,12 +61,40 @@ def parse_z_valence(stream: typing.BinaryIO) -> int:
     except ValueError as exception:
         raise ValueError(f'parsed value for the Z valence `{z_valence}` is not a valid number.') from exception
 
-    if int(z_valence) != z_valence:
+    if not z_valence.is_integer():
         raise ValueError(f'parsed value for the Z valence `{z_valence}` is not an integer.')
 
     return int(z_valence)
 
 
+def parse_element(stream: typing.BinaryIO) -> str:
+    """Parse the content of the PSML file to determine the element.
+
+    :param stream: a filelike object with the binary content of the file.
+    :return: the symbol of the element following the IUPAC naming standard.
+    """
+    return _get_element(_parse_pseudo_atom_spec(stream))
+
+
+def parse_z_valence(stream: typing.BinaryIO) -> int:
+    """Parse the content of the PSML file to determine the Z valence.
+
+    :param stream: a filelike object with the binary content of the file.
+    :return: the Z valence.
+    """
+    return _get_z_valence(_parse_pseudo_atom_spec(stream))
+
+
+def parse_attributes(stream: typing.BinaryIO) -> tuple[str, int]:
+    """Parse the content of the PSML file to determine both the element and the Z valence in a single pass.
+
+    :param stream: a filelike object with the binary content of the file.
+    :return: tuple of the symbol of the element and the Z valence.
+    """
+    attributes = _parse_pseudo_atom_spec(stream)
+    return _get_element(attributes), _get_z_valence(attributes)
+
+
 class PsmlData(PseudoPotentialData):
     """Data plugin to represent a pseudo potential in PSML format."""
 
@@ -81,9 +124,7 @@ class PsmlData(PseudoPotentialData):
         source = self.prepare_source(source)
         super().set_file(source, filename, **kwargs)
         source.seek(0)
-        self.element = parse_element(source)
-        source.seek(0)
-        self.z_valence = parse_z_valence(source)
+        self.element, self.z_valence = parse_attributes(source)
 
     @property
     def z_valence(self) -> typing.Optional[int]:
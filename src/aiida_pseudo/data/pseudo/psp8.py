@@ -63,4 +63,4 @@ class Psp8Data(PseudoPotentialData):
         source = self.prepare_source(source)
         super().set_file(source, filename, **kwargs)
         source.seek(0)
-        self.element = parse_element(source)
+        self._set_element_unchecked(parse_element(source))
@@ -47,7 +47,7 @@ def parse_z_valence(content: str) -> int:
             except ValueError as exception:
                 raise ValueError(f'parsed value for the Z valence `{z_valence}` is not a valid number.') from exception
 
-            if int(z_valence) != z_valence:
+            if not z_valence.is_integer():
                 raise ValueError(f'parsed value for the Z valence `{z_valence}` is not an integer.')
 
             return int(z_valence)
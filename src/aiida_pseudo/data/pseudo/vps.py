@@ -1,4 +1,5 @@
 """Module for data plugin to represent a pseudo potential in VPS format."""
+import io
 import pathlib
 import re
 import typing
@@ -14,7 +15,76 @@ REGEX_ATOMIC_NUMBER = re.compile(r"""\s*AtomSpecies\s*(?P<atomic_number>[\d]{1,3
 REGEX_Z_VALENCE = re.compile(r"""\s*valence\.electron\s*(?P<z_valence>""" + PATTERN_FLOAT + r""")\s*""", re.I)
 REGEX_XC_TYPE = re.compile(r"""\s*xc\.type\s*(?P<xc_type>[A-Z]{3})\s*""", re.I)
 
-VALID_XC_TYPES = ('LDA', 'LSDA-CA', 'LSDA-PW', 'GGA-PBE', 'EXX-TEST')
+VALID_XC_TYPES = frozenset({'LDA', 'LSDA-CA', 'LSDA-PW', 'GGA-PBE', 'EXX-TEST'})
+
+SYMBOL_BY_ATOMIC_NUMBER = {atomic_number: values['symbol'] for atomic_number, values in elements.items()}
+
+
+REGEX_HEADER = re.compile(
+    r"""\s*AtomSpecies\s*(?P<atomic_number>[\d]{1,3})\s*"""
+    r"""|\s*valence\.electron\s*(?P<z_valence>""" + PATTERN_FLOAT + r""")\s*"""
+    r"""|\s*xc\.type\s*(?P<xc_type>[A-Z]{3})\s*""",
+    re.I,
+)
+REGEX_HEADER_BYTES = re.compile(REGEX_HEADER.pattern.encode('ascii'), re.I)
+REGEX_FLOAT_BYTES = re.compile(PATTERN_FLOAT.encode('ascii'))
+
+HEADER_KEYS = {'atomic_number': b'atomspecies', 'z_valence': b'valence.electron', 'xc_type': b'xc.type'}
+
+
+def _get_element(atomic_number: str) -> str:
+    """Return the element for the atomic number parsed from the VPS content.
+
+    :param atomic_number: the parsed atomic number.
+    :return: the symbol of the element following the IUPAC naming standard.
+    """
+    try:
+        atomic_number = int(atomic_number)
+    except ValueError as exception:
+        raise ValueError(f'parsed value for the atomic number `{atomic_number}` is not a valid number.') from exception
+
+    try:
+        element = SYMBOL_BY_ATOMIC_NUMBER[atomic_number]
+    except KeyError as exception:
+        raise ValueError(
+            f'parsed value for the atomic number `{atomic_number}` is not in aiida.common.constants.elements.'
+        ) from exception
+
+    return element
+
+
+def _get_z_valence(z_valence: str) -> int:
+    """Return the Z valence for the value parsed from the VPS content.
+
+    :param z_valence: the parsed Z valence.
+    :return: the number of valence electrons for which the pseudopotential was generated.
+    """
+    try:
+        z_valence = float(z_valence)
+    except ValueError as exception:
+        raise ValueError(f'parsed value for the Z valence `{z_valence}` is not a valid number.') from exception
+
+    if not z_valence.is_integer():
+        raise ValueError(f'parsed value for the Z valence `{z_valence}` is not an integer')
+
+    return int(z_valence)
+
+
+def _get_xc_type(xc_type: str) -> str:
+    """Return the exchange-correlation functional type for the value parsed from the VPS content.
+
+    :param xc_type: the parsed exchange-correlation type.
+    :return: the OpenMX-compatible name of the exchange-correlation type.
+    """
+    if xc_type == 'GGA':
+        xc_type = 'GGA-PBE'
+
+    if xc_type not in VALID_XC_TYPES:
+        raise ValueError(
+            f'parsed value for the exchange-correlation type `{xc_type}` is not a valid OpenMX XcType string.'
+        )
+
+    return xc_type
 
 
 def parse_element(content: str):
@@ -26,23 +96,7 @@ def parse_element(content: str):
     match = REGEX_ATOMIC_NUMBER.search(content)
 
     if match:
-        atomic_number = match.group('atomic_number')
-
-        try:
-            atomic_number = int(atomic_number)
-        except ValueError as exception:
-            raise ValueError(
-                f'parsed value for the atomic number `{atomic_number}` is not a valid number.'
-            ) from exception
-
-        try:
-            element = elements[atomic_number]['symbol']
-        except KeyError as exception:
-            raise ValueError(
-                f'parsed value for the atomic number `{atomic_number}` is not in aiida.common.constants.elements.'
-            ) from exception
-
-        return element
+        return _get_element(match.group('atomic_number'))
 
     raise ValueError(f'could not parse the element from the VPS content: {content}')
 
@@ -56,17 +110,7 @@ def parse_z_valence(content: str):
     match = REGEX_Z_VALENCE.search(content)
 
     if match:
-        z_valence = match.group('z_valence')
-
-        try:
-            z_valence = float(z_valence)
-        except ValueError as exception:
-            raise ValueError(f'parsed value for the Z valence `{z_valence}` is not a valid number.') from exception
-
-        if int(z_valence) != z_valence:
-            raise ValueError(f'parsed value for the Z valence `{z_valence}` is not an integer')
-
-        return int(z_valence)
+        return _get_z_valence(match.group('z_valence'))
 
     raise ValueError(f'could not parse the Z valence from the VPS content: {content}')
 
@@ -80,19 +124,105 @@ def parse_xc_type(content: str):
     match = REGEX_XC_TYPE.search(content)
 
     if match:
-        xc_type = match.group('xc_type')
+        return _get_xc_type(match.group('xc_type'))
 
-        if xc_type == 'GGA':
-            xc_type = 'GGA-PBE'
+    raise ValueError(f'could not parse the exchange-correlation type from the VPS content: {content}')
 
-        if xc_type not in VALID_XC_TYPES:
-            raise ValueError(
-                f'parsed value for the exchange-correlation type `{xc_type}` is not a valid OpenMX XcType string.'
-            )
 
-        return xc_type
+def _find_vps_header_values(content: bytes) -> typing.Optional[dict]:
+    """Find the raw values of the header fields in the VPS content by searching for the literal keys.
 
-    raise ValueError(f'could not parse the exchange-correlation type from the VPS content: {content}')
+    Each key is located with ``bytes.find`` in the lowercased content, after which the value is taken as the first word
+    that follows it. This is considerably faster than scanning the content with ``REGEX_HEADER_BYTES``, but only covers
+    well-formed headers: as soon as a key or value is not exactly what the regular expression would match, ``None`` is
+    returned and the caller should fall back to the regular expression.
+
+    :param content: the content of the file as bytes.
+    :return: dictionary with the raw values of the header fields or ``None`` if any of them could not be determined.
+    """
+    lowered = content.lower()
+    values = {}
+
+    for key, literal in HEADER_KEYS.items():
+        index = lowered.find(literal)
+
+        if index == -1:
+            return None
+
+        # Only accept keys at the start of a word that do not directly follow ``xc.type``, because the regular
+        # expression could otherwise consume the start of the key as the value of the exchange-correlation type. Only a
+        # few bytes before the key are inspected: if those are all whitespace, the key is conservatively rejected.
+        if index > 0 and not lowered[index - 1 : index].isspace():
+            return None
+
+        preceding = lowered[max(0, index - 32) : index].rstrip()
+
+        if (not preceding and index > 32) or preceding.endswith(HEADER_KEYS['xc_type']):
+            return None
+
+        start = index + len(literal)
+        window = content[start : start + 80].lstrip()
+        word = window.split(None, 1)[0] if window else b''
+
+        # The word has to be followed by whitespace within the window, otherwise it may have been truncated.
+        if len(word) == len(window):
+            return None
+
+        if key == 'atomic_number' and not (word.isdigit() and len(word) <= 3):
+            return None
+
+        if key == 'z_valence' and REGEX_FLOAT_BYTES.fullmatch(word) is None:
+            return None
+
+        if key == 'xc_type' and not (word.isalpha() and len(word) == 3):
+            return None
+
+        values[key] = word.decode('ascii')
+
+    return values
+
+
+def parse_vps_header(content: typing.Union[str, bytes]) -> dict:
+    """Parse the content of the VPS file to determine the element, Z valence and exchange-correlation type.
+
+    The content is scanned only once for all three fields and the scan stops as soon as all fields have been found,
+    which is typically in the header at the top of the file. The content can also be passed as raw bytes, in which case
+    it is scanned without being decoded, since all fields are plain ASCII.
+
+    :param content: the content of the file, either decoded or as bytes.
+    :return: dictionary with the keys ``element``, ``z_valence`` and ``xc_type``.
+    """
+    values = _find_vps_header_values(content) if isinstance(content, bytes) else None
+
+    if values is None:
+        regex = REGEX_HEADER_BYTES if isinstance(content, bytes) else REGEX_HEADER
+        values = {}
+
+        for match in regex.finditer(content):
+            for key, value in match.groupdict().items():
+                if value is not None and key not in values:
+                    values[key] = value.decode('ascii') if isinstance(value, bytes) else value
+
+            if len(values) == 3:
+                break
+
+    if len(values) != 3 and isinstance(content, bytes):
+        content = content.decode('utf-8', errors='replace')
+
+    if 'atomic_number' not in values:
+        raise ValueError(f'could not parse the element from the VPS content: {content}')
+
+    if 'z_valence' not in values:
+        raise ValueError(f'could not parse the Z valence from the VPS content: {content}')
+
+    if 'xc_type' not in values:
+        raise ValueError(f'could not parse the exchange-correlation type from the VPS content: {content}')
+
+    return {
+        'element': _get_element(values['atomic_number']),
+        'z_valence': _get_z_valence(values['z_valence']),
+        'xc_type': _get_xc_type(values['xc_type']),
+    }
 
 
 class VpsData(PseudoPotentialData):
@@ -125,10 +255,29 @@ class VpsData(PseudoPotentialData):
         source = self.prepare_source(source)
         super().set_file(source, filename, **kwargs)
         source.seek(0)
-        content = source.read().decode('utf-8')
-        self.element = parse_element(content)
-        self.z_valence = parse_z_valence(content)
-        self.xc_type = parse_xc_type(content)
+
+        # The fields are defined in the header at the top of the file, so first try to parse them from just the first
+        # lines, such that the rest of the content does not have to be scanned. The head is cut at the last newline
+        # such that a value can never be truncated. Only if that fails, the entire content is parsed. The content is
+        # scanned as raw bytes since all fields are plain ASCII, which saves decoding it.
+        # For an in-memory stream, which is what ``prepare_source`` returns for a filepath and what is passed when
+        # parsing a family from a directory or archive, ``getvalue`` returns the underlying bytes without copying them,
+        # so the content is parsed directly instead of being read from the stream a second time.
+        content = source.getvalue() if isinstance(source, io.BytesIO) else None
+        head = content[:4096] if content is not None else source.read(4096)
+        head = head[: head.rfind(b'\n') + 1]
+
+        try:
+            header = parse_vps_header(head)
+        except ValueError:
+            if content is None:
+                source.seek(0)
+                content = source.read()
+            header = parse_vps_header(content)
+
+        self._set_element_unchecked(header['element'])
+        self.z_valence = header['z_valence']
+        self.xc_type = header['xc_type']
 
     @property
     def z_valence(self) -> typing.Optional[int]:
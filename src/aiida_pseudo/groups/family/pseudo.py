@@ -1,4 +1,6 @@
 """Subclass of ``Group`` that serves as a base class for representing pseudo potential families."""
+import os
+import pathlib
 import re
 from typing import List, Mapping, Optional, Tuple, Union
 
@@ -11,6 +13,8 @@ from aiida_pseudo.data.pseudo import PseudoPotentialData
 
 __all__ = ('PseudoPotentialFamily',)
 
+REGEX_ELEMENT_FROM_FILENAME = re.compile(r'([A-Za-z]{1,2})\.\w+')
+
 LegacyStructureData = DataFactory('core.structure')  # pylint: disable=invalid-name
 
 try:
@@ -21,6 +25,42 @@ else:
     structures_classes = (LegacyStructureData, StructureData)
 
 
+def iter_tar_stream_files(fileobj):
+    """Iterate over the files in a (compressed) tar archive stream, which should all be located in a single directory.
+
+    Directory entries are skipped. Since the archive is read as a stream, the content of each file should be read
+    before continuing to the next one.
+
+    :param fileobj: binary filelike object with the content of the (compressed) tar archive.
+    :return: generator of tuples of the path of the file in the archive and a binary filelike object with its content.
+    :raises tarfile.TarError: if ``fileobj`` is not a valid tar archive.
+    :raises ValueError: if the archive contains an entry that is neither a file nor a directory.
+    :raises ValueError: if the archive contains files in more than one directory.
+    """
+    import tarfile
+
+    dirname = None
+
+    with tarfile.open(fileobj=fileobj, mode='r|*') as archive:
+        for member in archive:
+            if member.isdir():
+                continue
+
+            if not member.isfile():
+                raise ValueError(f'the archive contains at least one entry that is not a file: {member.name}')
+
+            filepath = pathlib.PurePosixPath(member.name)
+
+            if dirname is None:
+                dirname = filepath.parent
+            elif filepath.parent != dirname:
+                raise ValueError(
+                    f'the archive contains files in more than one directory: `{dirname}` and `{filepath.parent}`'
+                )
+
+            yield filepath, archive.extractfile(member)
+
+
 class PseudoPotentialFamily(Group):
     """Group to represent a pseudo potential family.
 
@@ -87,13 +127,64 @@ class PseudoPotentialFamily(Group):
         if not dirpath.is_dir():
             raise ValueError(f'`{dirpath}` is not a directory')
 
-        dirpath_contents = list(dirpath.iterdir())
+        with os.scandir(dirpath) as iterator:
+            entries = list(iterator)
 
-        if len(dirpath_contents) == 1 and (dirpath / dirpath_contents[0]).is_dir():
-            dirpath = dirpath_contents[0]
+        if len(entries) == 1 and entries[0].is_dir():
+            dirpath = pathlib.Path(entries[0].path)
 
         return dirpath
 
+    @classmethod
+    def _parse_pseudo(cls, source, filename, pseudo_type, deduplicate, md5=None):
+        """Parse a single pseudo potential from a binary stream or file into a data node.
+
+        If the constructor of the pseudo type does not define the element, it is parsed from the ``filename``.
+
+        :param source: binary stream with the content of the pseudo potential file or the path to the file on disk.
+        :param filename: the filename of the pseudo potential file.
+        :param pseudo_type: subclass of ``PseudoPotentialData`` to be used for the parsed pseudo.
+        :param deduplicate: if True, will scan database for existing pseudo potentials of same type and with the same
+            md5 checksum, and use that instead of the parsed one.
+        :param md5: optional md5 checksum of the content of ``source``, if it was already computed.
+        :return: the data node.
+        :raises ParsingError: if the constructor of the pseudo type fails or no element could be determined.
+        """
+        from aiida.common.exceptions import ParsingError
+
+        if deduplicate:
+            pseudo = pseudo_type.get_or_create(source, filename=filename, md5=md5)
+        else:
+            pseudo = pseudo_type(source, filename=filename)
+
+        if pseudo.element is None:
+            match = REGEX_ELEMENT_FROM_FILENAME.match(filename)
+            if match is None:
+                raise ParsingError(
+                    f'`{pseudo.__class__}` constructor did not define the element and could not parse a valid '
+                    f'element symbol from the filename `{filename}` either. It should have the format '
+                    '`ELEMENT.EXTENSION`'
+                )
+            pseudo.element = match.group(1)
+
+        return pseudo
+
+    @staticmethod
+    def _validate_pseudos(pseudos, source):
+        """Validate the pseudo potentials parsed from ``source`` can make up a family.
+
+        :param pseudos: list of parsed pseudo potential data nodes.
+        :param source: description of where the pseudo potentials were parsed from, used in error messages.
+        :raises ValueError: if ``pseudos`` is empty or contains multiple pseudo potentials for the same element.
+        """
+        if not pseudos:
+            raise ValueError(f'no pseudo potentials were parsed from {source}')
+
+        elements = set(pseudo.element for pseudo in pseudos)
+
+        if len(pseudos) != len(elements):
+            raise ValueError(f'{source} contains pseudo potentials with duplicate elements')
+
     @classmethod
     def parse_pseudos_from_directory(cls, dirpath, pseudo_type=None, deduplicate=True):
         """Parse the pseudo potential files in the given directory into a list of data nodes.
@@ -118,43 +209,76 @@ class PseudoPotentialFamily(Group):
         """
         from aiida.common.exceptions import ParsingError
 
+        from aiida_pseudo.data.pseudo.pseudo import md5_from_directory
+
         pseudos = []
         dirpath = cls._validate_dirpath(dirpath)
         pseudo_type = cls._validate_pseudo_type(pseudo_type)
+        filepaths = []
+
+        with os.scandir(dirpath) as iterator:
+            for entry in iterator:
+                filepath = pathlib.Path(entry.path)
+                if not entry.is_file():
+                    raise ValueError(f'dirpath `{dirpath}` contains at least one entry that is not a file: {filepath}')
+                filepaths.append(filepath)
+
+        # Only the checksums, which are needed to look for duplicates, are computed concurrently. The files are read
+        # again when their data node is created, such that only a single file is kept in memory at a time.
+        md5s = md5_from_directory(dirpath, max_workers=min(32, len(filepaths) or 1)) if deduplicate else {}
+
+        for filepath in filepaths:
+            try:
+                pseudo = cls._parse_pseudo(filepath, filepath.name, pseudo_type, deduplicate, md5=md5s.get(filepath))
+            except ParsingError as exception:
+                raise ParsingError(f'failed to parse `{filepath}`: {exception}') from exception
 
-        for filepath in dirpath.iterdir():
-            filename = filepath.name
-
-            if not filepath.is_file():
-                raise ValueError(f'dirpath `{dirpath}` contains at least one entry that is not a file: {filepath}')
-
-            with open(filepath, 'rb') as handle:
-                try:
-                    if deduplicate:
-                        pseudo = pseudo_type.get_or_create(handle, filename=filename)
-                    else:
-                        pseudo = pseudo_type(handle, filename=filename)
-                except ParsingError as exception:
-                    raise ParsingError(f'failed to parse `{filepath}`: {exception}') from exception
-
-            if pseudo.element is None:
-                match = re.search(r'^([A-Za-z]{1,2})\.\w+', filename)
-                if match is None:
-                    raise ParsingError(
-                        f'`{pseudo.__class__}` constructor did not define the element and could not parse a valid '
-                        'element symbol from the filename `{filename}` either. It should have the format '
-                        '`ELEMENT.EXTENSION`'
-                    )
-                pseudo.element = match.group(1)
             pseudos.append(pseudo)
 
-        if not pseudos:
-            raise ValueError(f'no pseudo potentials were parsed from `{dirpath}`')
+        cls._validate_pseudos(pseudos, f'directory `{dirpath}`')
 
-        elements = set(pseudo.element for pseudo in pseudos)
+        return pseudos
 
-        if len(pseudos) != len(elements):
-            raise ValueError(f'directory `{dirpath}` contains pseudo potentials with duplicate elements')
+    @classmethod
+    def parse_pseudos_from_tar_stream(cls, fileobj, pseudo_type=None, deduplicate=True):
+        """Parse the pseudo potential files in a (compressed) tar archive stream into a list of data nodes.
+
+        The members of the archive are read sequentially from the stream and parsed from memory, without extracting
+        them to disk first. The same restrictions as for ``parse_pseudos_from_directory`` apply to the archive content:
+        all files should be located in the root of the archive or in a single directory.
+
+        :param fileobj: binary filelike object with the content of the (compressed) tar archive.
+        :param pseudo_type: subclass of ``PseudoPotentialData`` to be used for the parsed pseudos. If not specified and
+            the family only defines a single supported pseudo type in ``_pseudo_types`` then that will be used otherwise
+            a ``ValueError`` is raised.
+        :param deduplicate: if True, will scan database for existing pseudo potentials of same type and with the same
+            md5 checksum, and use that instead of the parsed one.
+        :return: list of data nodes
+        :raises tarfile.TarError: if ``fileobj`` is not a valid tar archive.
+        :raises ValueError: if the archive contains anything other than files or files in different directories.
+        :raises ValueError: if the archive contains multiple pseudo potentials for the same element.
+        :raises ValueError: if ``pseudo_type`` is explicitly specified and is not supported by this family class.
+        :raises ValueError: if ``pseudo_type`` is not specified and the class supports more than one pseudo type.
+        :raises ParsingError: if the constructor of the pseudo type fails for one of the files in the archive.
+        """
+        import io
+
+        from aiida.common.exceptions import ParsingError
+
+        pseudos = []
+        pseudo_type = cls._validate_pseudo_type(pseudo_type)
+
+        for filepath, handle in iter_tar_stream_files(fileobj):
+            source = io.BytesIO(handle.read())
+
+            try:
+                pseudo = cls._parse_pseudo(source, filepath.name, pseudo_type, deduplicate)
+            except ParsingError as exception:
+                raise ParsingError(f'failed to parse `{filepath}`: {exception}') from exception
+
+            pseudos.append(pseudo)
+
+        cls._validate_pseudos(pseudos, 'the archive')
 
         return pseudos
 
@@ -177,13 +301,51 @@ class PseudoPotentialFamily(Group):
         :raises ValueError: if ``pseudo_type`` is not specified and the class supports more than one pseudo type.
         :raises ParsingError: if the constructor of the pseudo type fails for one of the files in the ``dirpath``.
         """
+        return cls._create_from_parsed_pseudos(
+            label, description, cls.parse_pseudos_from_directory, dirpath, pseudo_type, deduplicate=deduplicate
+        )
+
+    @classmethod
+    def create_from_tar_stream(cls, fileobj, label, *, description='', pseudo_type=None, deduplicate=True):
+        """Create a new ``PseudoPotentialFamily`` from the pseudo potentials contained in a tar archive stream.
+
+        :param fileobj: binary filelike object with the content of the (compressed) tar archive.
+        :param label: label to give to the ``PseudoPotentialFamily``, should not already exist.
+        :param description: description to give to the family.
+        :param pseudo_type: subclass of ``PseudoPotentialData`` to be used for the parsed pseudos. If not specified and
+            the family only defines a single supported pseudo type in ``_pseudo_types`` then that will be used otherwise
+            a ``ValueError`` is raised.
+        :param deduplicate: if True, will scan database for existing pseudo potentials of same type and with the same
+            md5 checksum, and use that instead of the parsed one.
+        :raises ValueError: if a ``PseudoPotentialFamily`` already exists with the given name.
+        :raises tarfile.TarError: if ``fileobj`` is not a valid tar archive.
+        :raises ValueError: if the archive contains anything other than files or files in different directories.
+        :raises ValueError: if the archive contains multiple pseudo potentials for the same element.
+        :raises ValueError: if ``pseudo_type`` is explicitly specified and is not supported by this family class.
+        :raises ValueError: if ``pseudo_type`` is not specified and the class supports more than one pseudo type.
+        :raises ParsingError: if the constructor of the pseudo type fails for one of the files in the archive.
+        """
+        return cls._create_from_parsed_pseudos(
+            label, description, cls.parse_pseudos_from_tar_stream, fileobj, pseudo_type, deduplicate=deduplicate
+        )
+
+    @classmethod
+    def _create_from_parsed_pseudos(cls, label, description, parse, *args, **kwargs):
+        """Create a new ``PseudoPotentialFamily`` with the pseudo potentials returned by the ``parse`` callable.
+
+        :param label: label to give to the ``PseudoPotentialFamily``, should not already exist.
+        :param description: description to give to the family.
+        :param parse: callable that returns the list of parsed pseudo potentials when called with ``args`` and
+            ``kwargs``.
+        :raises ValueError: if a ``PseudoPotentialFamily`` already exists with the given name.
+        """
         type_check(description, str, allow_none=True)
 
         if cls.collection.count(filters={'label': label}):
             raise ValueError(f'the {cls.__name__} `{label}` already exists')
 
         family = cls(label=label, description=description)
-        pseudos = cls.parse_pseudos_from_directory(dirpath, pseudo_type, deduplicate=deduplicate)
+        pseudos = parse(*args, **kwargs)
 
         # Only store the ``Group`` and the pseudo nodes now, such that we don't have to worry about the clean up in the
         # case that an exception is raised during creating them.
@@ -200,9 +362,16 @@ class PseudoPotentialFamily(Group):
         """
         return self.base.extras.get(self._key_pseudo_type, None)
 
-    def update_pseudo_type(self):
-        """Update the pseudo type, stored as an extra, based on the current nodes in the family."""
-        pseudo_types = {pseudo.__class__ for pseudo in self.pseudos.values()}
+    def update_pseudo_type(self, pseudos=None):
+        """Update the pseudo type, stored as an extra, based on the current nodes in the family.
+
+        :param pseudos: optional iterable of the pseudo potentials that are currently in the family. If not specified,
+            the values of ``pseudos`` are used, which may need to be loaded from the database.
+        """
+        if pseudos is None:
+            pseudos = self.pseudos.values()
+
+        pseudo_types = {pseudo.__class__ for pseudo in pseudos}
 
         if pseudo_types:
             assert len(pseudo_types) == 1, 'Family contains pseudopotential data nodes of various types.'
@@ -210,6 +379,16 @@ class PseudoPotentialFamily(Group):
         else:
             entry_point_name = None
 
+        # Setting an extra of a stored group writes to the database, so this is skipped if the value does not change,
+        # for example when nodes of the same type are added to the family in multiple batches.
+        try:
+            current = self.base.extras.get(self._key_pseudo_type)
+        except AttributeError:
+            pass
+        else:
+            if current == entry_point_name:
+                return
+
         self.base.extras.set(self._key_pseudo_type, entry_point_name)
 
     def add_nodes(self, nodes):
@@ -222,6 +401,7 @@ class PseudoPotentialFamily(Group):
         :raises TypeError: if nodes are not an instance or list of instance of any of the classes listed by
             ``PseudoPotentialFamily._pseudo_types``.
         :raises ValueError: if any of the nodes are not stored or their elements already exist in this family.
+        :raises ValueError: if the nodes contain more than one pseudo potential for the same element.
         """
         if not self.is_stored:
             raise exceptions.ModificationNotAllowed('cannot add nodes to an unstored group')
@@ -232,12 +412,15 @@ class PseudoPotentialFamily(Group):
         if any(not isinstance(node, self._pseudo_types) for node in nodes):
             raise TypeError(f'only nodes of types `{self._pseudo_types}` can be added: {nodes}')
 
+        existing = self.pseudos
         pseudos = {}
 
         # Check for duplicates before adding any pseudo to the internal cache
         for pseudo in nodes:
-            if pseudo.element in self.elements:
+            if pseudo.element in existing:
                 raise ValueError(f'element `{pseudo.element}` already present in this family')
+            if pseudo.element in pseudos:
+                raise ValueError(f'the nodes contain more than one pseudo potential for element `{pseudo.element}`')
             pseudos[pseudo.element] = pseudo
 
         self.pseudos.update(pseudos)
@@ -255,15 +438,15 @@ class PseudoPotentialFamily(Group):
         if not isinstance(nodes, (list, tuple)):
             nodes = (nodes,)
 
-        removed = [node.pk for node in nodes]
+        removed = {node.pk for node in nodes}
         self._pseudos = {pseudo.element: pseudo for pseudo in self.pseudos.values() if pseudo.pk not in removed}
-        self.update_pseudo_type()
+        self.update_pseudo_type(self._pseudos.values())
 
     def clear(self):
         """Remove all the pseudopotentials from this family."""
         super().clear()
         self._pseudos = None
-        self.update_pseudo_type()
+        self.update_pseudo_type(())
 
     @property
     def pseudos(self):
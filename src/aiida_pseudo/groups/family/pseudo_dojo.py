@@ -2,20 +2,22 @@
 from __future__ import annotations
 
 import json
+import os
 import pathlib
-import re
 import warnings
-from typing import ClassVar, NamedTuple, Sequence
+from typing import ClassVar, NamedTuple
 
 from aiida.common.exceptions import ParsingError
 
 from aiida_pseudo.data.pseudo import JthXmlData, PsmlData, Psp8Data, UpfData
 
-from ..mixins import RecommendedCutoffMixin
-from .pseudo import PseudoPotentialFamily
+from ..mixins import ConfigurationLabelsMixin, RecommendedCutoffMixin
+from .pseudo import REGEX_ELEMENT_FROM_FILENAME, PseudoPotentialFamily, iter_tar_stream_files
 
 __all__ = ('PseudoDojoConfiguration', 'PseudoDojoFamily')
 
+STRINGENCIES = ('low', 'normal', 'high')
+
 
 class PseudoDojoConfiguration(NamedTuple):
     """Named tuple that represents a PseudoDojo configuration."""
@@ -31,7 +33,7 @@ class PseudoDojoConfiguration(NamedTuple):
         return f'PseudoDojo v{self.version} {self.functional} {self.relativistic} {self.protocol} {self.pseudo_format}'
 
 
-class PseudoDojoFamily(RecommendedCutoffMixin, PseudoPotentialFamily):
+class PseudoDojoFamily(ConfigurationLabelsMixin, RecommendedCutoffMixin, PseudoPotentialFamily):
     """Subclass of ``PseudoPotentialFamily`` designed to represent a PseudoDojo configuration.
 
     The ``PseudoDojoFamily`` is essentially a ``PseudoPotentialFamily`` with some additional constraints. It can only
@@ -39,7 +41,14 @@ class PseudoDojoFamily(RecommendedCutoffMixin, PseudoPotentialFamily):
     """
 
     _pseudo_types = (UpfData, PsmlData, Psp8Data, JthXmlData)
-    _pseudo_repo_file_extensions = ('djrepo',)
+    _pseudo_repo_file_extensions = frozenset({'djrepo'})
+    _md5_keys: ClassVar[dict[type, str]] = {
+        UpfData: 'md5_upf',
+        Psp8Data: 'md5',
+        PsmlData: 'md5_psml',
+        JthXmlData: 'md5',
+    }
+    _duals: ClassVar[dict[type, float]] = {UpfData: 4.0, Psp8Data: 4.0, PsmlData: 4.0, JthXmlData: 2.0}
 
     label_template = 'PseudoDojo/{version}/{functional}/{relativistic}/{protocol}/{pseudo_format}'
     default_configuration = PseudoDojoConfiguration('0.4', 'PBE', 'SR', 'standard', 'psp8')
@@ -136,12 +145,6 @@ class PseudoDojoFamily(RecommendedCutoffMixin, PseudoPotentialFamily):
         'PseudoDojo/1.0/LDA/SR/stringent/jthxml': 'paw_pw_stringent_xml',
     }
 
-    @classmethod
-    def get_valid_labels(cls) -> Sequence[str]:
-        """Return the tuple of labels of all valid PseudoDojo configurations."""
-        configurations = set(cls.valid_configurations)
-        return tuple(cls.format_configuration_label(configuration) for configuration in configurations)
-
     @classmethod
     def format_configuration_label(cls, configuration: PseudoDojoConfiguration) -> str:
         """Format a label for an `PseudoDojoFamily` with the required syntax.
@@ -197,10 +200,8 @@ class PseudoDojoFamily(RecommendedCutoffMixin, PseudoPotentialFamily):
         :param djrepo: dictionary loaded from DJREPO JSON file.
         :reutnrs: md5 string.
         """
-        md5_key_mapping = {UpfData: 'md5_upf', Psp8Data: 'md5', PsmlData: 'md5_psml', JthXmlData: 'md5'}
-
         try:
-            md5_key = md5_key_mapping[pseudo_type]
+            md5_key = cls._md5_keys[pseudo_type]
         except KeyError as exception:
             raise ValueError(
                 f'pseudo type `{pseudo_type}` is unsupported by PseudoDojo djrepos: {exception}'
@@ -228,10 +229,8 @@ class PseudoDojoFamily(RecommendedCutoffMixin, PseudoPotentialFamily):
         :returns: cutoffs dictionary (in eV) where keys are stringency levels and values are
             {'cutoff_wfc': ..., 'cutoff_rho': ...}
         """
-        dual_mapping = {UpfData: 4.0, Psp8Data: 4.0, PsmlData: 4.0, JthXmlData: 2.0}
-
         try:
-            dual = dual_mapping[pseudo_type]
+            dual = cls._duals[pseudo_type]
         except KeyError as exception:
             raise ValueError(
                 f'cannot get cutoffs for pseudo type `{pseudo_type}` because the appropriate dual '
@@ -245,9 +244,9 @@ class PseudoDojoFamily(RecommendedCutoffMixin, PseudoPotentialFamily):
         except KeyError as exception:
             raise ParsingError('neither `hints` or `ppgen_hints` are defined in the djrepo.') from exception
 
-        for stringency in ['low', 'normal', 'high']:
+        for stringency in STRINGENCIES:
             try:
-                ecutwfc = hints.get(stringency, {})['ecut']
+                ecutwfc = hints[stringency]['ecut']
             except KeyError as exception:
                 raise ParsingError(f'stringency `{stringency}` is not defined in the djrepo `hints`') from exception
 
@@ -255,6 +254,56 @@ class PseudoDojoFamily(RecommendedCutoffMixin, PseudoPotentialFamily):
 
         return cutoffs
 
+    @classmethod
+    def _parse_djrepo(cls, djrepo, filename, pseudo_type):
+        """Parse the element, md5 and cutoffs from the content of a single djrepo file.
+
+        :param djrepo: dictionary loaded from DJREPO JSON file.
+        :param filename: the filename of the djrepo file, from which the element is parsed.
+        :param pseudo_type: subclass of ``PseudoPotentialData`` for which to parse the md5 and cutoffs.
+        :return: tuple of the element, the md5 and the cutoffs dictionary as returned by ``get_cutoffs_from_djrepo``.
+        :raises ParsingError: if the element, md5 or cutoffs could not be parsed.
+        """
+        match = REGEX_ELEMENT_FROM_FILENAME.match(filename)
+        if match is None:
+            raise ParsingError(
+                f'could not parse a valid element symbol from the filename `{filename}`. '
+                'It should have the format `ELEMENT.EXTENSION`'
+            )
+        element = match.group(1)
+
+        try:
+            md5 = cls.get_md5_from_djrepo(djrepo, pseudo_type=pseudo_type)
+        except (ParsingError, ValueError) as exception:
+            raise ParsingError(f'failed to parse md5 from djrepo file `{filename}`: {exception}') from exception
+
+        try:
+            djrepo_cutoffs = cls.get_cutoffs_from_djrepo(djrepo, pseudo_type=pseudo_type)
+        except ParsingError as exception:
+            raise ParsingError(f'failed to parse cutoffs from djrepo file `{filename}`: {exception}') from exception
+
+        return element, md5, djrepo_cutoffs
+
+    @classmethod
+    def _add_parsed_djrepo(cls, parsed, md5s, cutoffs, source):
+        """Add the element, md5 and cutoffs parsed by ``_parse_djrepo`` to the ``md5s`` and ``cutoffs`` dictionaries.
+
+        :param parsed: tuple of the element, md5 and cutoffs as returned by ``_parse_djrepo``.
+        :param md5s: dictionary of md5s per element to add the parsed md5 to.
+        :param cutoffs: dictionary of cutoffs per stringency and element to add the parsed cutoffs to.
+        :param source: description of where the djrepos were parsed from, used in error messages.
+        :raises ValueError: if ``md5s`` already contains the parsed element.
+        """
+        element, md5, djrepo_cutoffs = parsed
+
+        if element in md5s:
+            raise ValueError(f'{source} contains djrepos with duplicate elements`')
+
+        md5s[element] = md5
+
+        for stringency in STRINGENCIES:
+            cutoffs[stringency][element] = djrepo_cutoffs[stringency]
+
     @classmethod
     def parse_djrepos_from_folder(cls, dirpath: pathlib.Path, pseudo_type):
         """Parse the djrepo files in the given directory into a list of data nodes.
@@ -269,63 +318,78 @@ class PseudoDojoFamily(RecommendedCutoffMixin, PseudoPotentialFamily):
         :raises ValueError: if `dirpath` contains multiple djrepos for the same element.
         :raises ParsingError: if the constructor of the pseudo type fails for one of the files in the `dirpath`.
         """
+        from concurrent.futures import ThreadPoolExecutor
+
         md5s = {}
         cutoffs = {'low': {}, 'normal': {}, 'high': {}}
-        elements = []
+        filepaths = []
 
         dirpath = cls._validate_dirpath(dirpath)
 
-        for filepath in dirpath.iterdir():
-            filename = filepath.name
-
-            if not filepath.is_file():
-                raise ValueError(f'dirpath `{dirpath}` contains at least one entry that is not a file: {filepath}')
+        with os.scandir(dirpath) as iterator:
+            for entry in iterator:
+                filepath = pathlib.Path(entry.path)
 
-            # Some of the djrepo archives contain extraneous files. Here we skip files with unsupported extensions.
-            if filename.split('.')[-1] not in cls._pseudo_repo_file_extensions:
-                warnings.warn(f'filename {filename} does not have a supported extension. Skipping...')
-                continue
+                if not entry.is_file():
+                    raise ValueError(f'dirpath `{dirpath}` contains at least one entry that is not a file: {filepath}')
 
-            try:
-                with open(filepath, 'r', encoding='utf-8') as handle:
-                    djrepo = json.load(handle)
-            except ParsingError as exception:
-                raise ParsingError(f'failed to parse `{filepath}`: {exception}') from exception
-            else:
-                match = re.search(r'^([A-Za-z]{1,2})\.\w+', filename)
-                if match is None:
-                    raise ParsingError(
-                        f'could not parse a valid element symbol from the filename `{filename}`. '
-                        'It should have the format `ELEMENT.EXTENSION`'
-                    )
-                element = match.group(1)
-                if element in elements:
-                    raise ValueError(f'directory `{dirpath}` contains djrepos with duplicate elements`')
+                # Some of the djrepo archives contain extraneous files. Here we skip files with unsupported extensions.
+                if filepath.suffix[1:] not in cls._pseudo_repo_file_extensions:
+                    warnings.warn(f'filename {filepath.name} does not have a supported extension. Skipping...')
+                    continue
 
-                try:
-                    md5 = cls.get_md5_from_djrepo(djrepo, pseudo_type=pseudo_type)
-                except (ParsingError, ValueError) as exception:
-                    raise ParsingError(f'failed to parse md5 from djrepo file `{filename}`: {exception}') from exception
-                else:
-                    md5s[element] = md5
+                filepaths.append(filepath)
 
+        # Only reading the files is done concurrently, the content is parsed in order in the current thread.
+        with ThreadPoolExecutor(max_workers=min(32, len(filepaths) or 1)) as executor:
+            for filepath, content in zip(filepaths, executor.map(pathlib.Path.read_bytes, filepaths)):
                 try:
-                    djrepo_cutoffs = cls.get_cutoffs_from_djrepo(djrepo, pseudo_type=pseudo_type)
+                    djrepo = json.loads(content)
                 except ParsingError as exception:
-                    raise ParsingError(
-                        f'failed to parse cutoffs from djrepo file `{filename}`: {exception}'
-                    ) from exception
-                else:
-                    for stringency in ['low', 'normal', 'high']:
-                        cutoffs[stringency][element] = djrepo_cutoffs[stringency]
+                    raise ParsingError(f'failed to parse `{filepath}`: {exception}') from exception
 
-                elements.append(element)
+                parsed = cls._parse_djrepo(djrepo, filepath.name, pseudo_type)
+                cls._add_parsed_djrepo(parsed, md5s, cutoffs, f'directory `{dirpath}`')
 
         if (not cutoffs['low']) and (not cutoffs['normal']) and (not cutoffs['high']):
             raise ValueError(f'no djrepos were parsed from `{dirpath}`')
 
         return md5s, cutoffs
 
+    @classmethod
+    def parse_djrepos_from_tar_stream(cls, fileobj, pseudo_type):
+        """Parse the djrepo files in a (compressed) tar archive stream.
+
+        The members of the archive are read sequentially from the stream and parsed from memory, without extracting
+        them to disk first. The same restrictions as for ``parse_djrepos_from_folder`` apply to the archive content:
+        all files should be located in the root of the archive or in a single directory.
+
+        :param fileobj: binary filelike object with the content of the (compressed) tar archive.
+        :param pseudo_type: subclass of ``PseudoPotentialData`` for which to parse the md5s and cutoffs.
+        :return: element: value dictionaries containing md5s and cutoffs.
+        :raises tarfile.TarError: if ``fileobj`` is not a valid tar archive.
+        :raises ValueError: if the archive contains anything other than files or files in different directories.
+        :raises ValueError: if the archive contains multiple djrepos for the same element.
+        :raises ParsingError: if the element, md5 or cutoffs could not be parsed from one of the djrepos.
+        """
+        md5s = {}
+        cutoffs = {'low': {}, 'normal': {}, 'high': {}}
+
+        for filepath, handle in iter_tar_stream_files(fileobj):
+            # Some of the djrepo archives contain extraneous files. Here we skip files with unsupported extensions.
+            if filepath.suffix[1:] not in cls._pseudo_repo_file_extensions:
+                warnings.warn(f'filename {filepath.name} does not have a supported extension. Skipping...')
+                continue
+
+            djrepo = json.loads(handle.read())
+            parsed = cls._parse_djrepo(djrepo, filepath.name, pseudo_type)
+            cls._add_parsed_djrepo(parsed, md5s, cutoffs, 'the archive')
+
+        if (not cutoffs['low']) and (not cutoffs['normal']) and (not cutoffs['high']):
+            raise ValueError('no djrepos were parsed from the archive')
+
+        return md5s, cutoffs
+
     @classmethod
     def parse_djrepos_from_archive(cls, filepath_metadata: pathlib.Path, fmt=None, pseudo_type=None):
         """Parse metadata from a djrepo .tgz archive.
@@ -342,8 +406,22 @@ class PseudoDojoFamily(RecommendedCutoffMixin, PseudoPotentialFamily):
             cutoffs.
         """
         import shutil
+        import tarfile
         import tempfile
 
+        # Tar archives, which is the format in which PseudoDojo distributes the metadata, are parsed directly from the
+        # stream such that the djrepos do not first have to be written to and read back from a temporary directory.
+        if fmt in ('tar', 'gztar', 'bztar', 'xztar') or (fmt is None and tarfile.is_tarfile(filepath_metadata)):
+            try:
+                with open(filepath_metadata, 'rb') as handle:
+                    return cls.parse_djrepos_from_tar_stream(handle, pseudo_type=pseudo_type)
+            except tarfile.TarError as exception:
+                raise OSError(
+                    f'failed to unpack the metadata archive `{filepath_metadata}`: {exception}'
+                ) from exception
+            except ValueError as exception:
+                raise OSError(f'failed to parse djrepos from `{filepath_metadata}`: {exception}') from exception
+
         with tempfile.TemporaryDirectory() as dirpath:
             try:
                 shutil.unpack_archive(filepath_metadata, dirpath, format=fmt)
@@ -361,7 +439,7 @@ class PseudoDojoFamily(RecommendedCutoffMixin, PseudoPotentialFamily):
 
     def __init__(self, label=None, **kwargs):
         """Construct a new instance, validating that the label matches the required format."""
-        if label not in self.get_valid_labels():
+        if label not in self._get_valid_labels_set():
             raise ValueError(f'the label `{label}` is not a valid PseudoDojo configuration label.')
 
         super().__init__(label=label, **kwargs)
@@ -1,9 +1,9 @@
 """Subclass of ``PseudoPotentialFamily`` designed to represent an SSSP configuration."""
-from typing import NamedTuple, Optional, Sequence
+from typing import NamedTuple, Optional
 
 from aiida_pseudo.data.pseudo import UpfData
 
-from ..mixins import RecommendedCutoffMixin
+from ..mixins import ConfigurationLabelsMixin, RecommendedCutoffMixin
 from .pseudo import PseudoPotentialFamily
 
 __all__ = ('SsspConfiguration', 'SsspFamily')
@@ -21,7 +21,7 @@ class SsspConfiguration(NamedTuple):
         return f'SSSP v{self.version} {self.functional} {self.protocol}'
 
 
-class SsspFamily(RecommendedCutoffMixin, PseudoPotentialFamily):
+class SsspFamily(ConfigurationLabelsMixin, RecommendedCutoffMixin, PseudoPotentialFamily):
     """Subclass of ``PseudoPotentialFamily`` designed to represent an SSSP configuration.
 
     The ``SsspFamily`` is essentially a ``PseudoPotentialFamily`` with some additional constraints. It can only be used
@@ -50,11 +50,6 @@ class SsspFamily(RecommendedCutoffMixin, PseudoPotentialFamily):
         SsspConfiguration('1.3', 'PBEsol', 'precision'),
     )
 
-    @classmethod
-    def get_valid_labels(cls) -> Sequence[str]:
-        """Return the tuple of labels of all valid SSSP configurations."""
-        return tuple(cls.format_configuration_label(configuration) for configuration in cls.valid_configurations)
-
     @classmethod
     def format_configuration_label(cls, configuration: SsspConfiguration) -> str:
         """Format a label for an `SsspFamily` with the required syntax.
@@ -91,7 +86,7 @@ class SsspFamily(RecommendedCutoffMixin, PseudoPotentialFamily):
 
     def __init__(self, label=None, **kwargs):
         """Construct a new instance, validating that the label matches the required format."""
-        if label not in self.get_valid_labels():
+        if label not in self._get_valid_labels_set():
             raise ValueError(f'the label `{label}` is not a valid SSSP configuration label.')
 
         super().__init__(label=label, **kwargs)
@@ -1,4 +1,5 @@
 """Module containing various mixins for ``Group`` subclasses."""
+from .configurations import *
 from .cutoffs import *
 
-__all__ = cutoffs.__all__
+__all__ = configurations.__all__ + cutoffs.__all__
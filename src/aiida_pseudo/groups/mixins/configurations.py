@@ -0,0 +1,41 @@
+"""Mixin that adds the labels of the valid configurations to a ``Group`` subclass."""
+from typing import FrozenSet, Sequence
+
+__all__ = ('ConfigurationLabelsMixin',)
+
+
+class ConfigurationLabelsMixin:
+    """Mixin that adds the labels of the valid configurations to a ``Group`` subclass.
+
+    The class should define the ``valid_configurations`` attribute and the ``format_configuration_label`` class method.
+    """
+
+    @classmethod
+    def get_valid_labels(cls) -> Sequence[str]:
+        """Return the tuple of labels of all valid configurations.
+
+        .. note:: the labels are formatted only once and then cached on the class itself. The cache is read from the
+            ``__dict__`` of the class such that a subclass never inherits the cached labels of its parent class.
+        """
+        try:
+            return cls.__dict__['_valid_labels']
+        except KeyError:
+            pass
+
+        # Duplicate configurations are dropped while keeping the order of ``valid_configurations``.
+        configurations = dict.fromkeys(cls.valid_configurations)
+        cls._valid_labels = tuple(cls.format_configuration_label(configuration) for configuration in configurations)
+
+        return cls._valid_labels
+
+    @classmethod
+    def _get_valid_labels_set(cls) -> FrozenSet[str]:
+        """Return the frozenset of labels of all valid configurations for constant time membership tests."""
+        try:
+            return cls.__dict__['_valid_labels_set']
+        except KeyError:
+            pass
+
+        cls._valid_labels_set = frozenset(cls.get_valid_labels())
+
+        return cls._valid_labels_set
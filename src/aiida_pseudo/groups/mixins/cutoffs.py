@@ -1,4 +1,6 @@
 """Mixin that adds support of recommended cutoffs to a ``Group`` subclass, using its extras."""
+import copy
+import functools
 import warnings
 from typing import Optional
 
@@ -19,6 +21,27 @@ else:
 
 __all__ = ('RecommendedCutoffMixin',)
 
+CUTOFF_KEYS = frozenset({'cutoff_wfc', 'cutoff_rho'})
+
+
+@functools.lru_cache(maxsize=32)
+def _get_energy_unit_error(unit: str) -> Optional[str]:
+    """Return the error message if the unit is not a valid unit of energy.
+
+    Checking a unit against the ``pint`` registry is relatively expensive and the same few units are validated over and
+    over, so the result is cached. The error message is returned instead of raised, since exceptions are not cached.
+
+    :param unit: the name of the unit.
+    :return: the error message or ``None`` if the unit is a valid unit of energy.
+    """
+    if unit not in U:
+        return f'`{unit}` is not a valid unit.'
+
+    if not U.Quantity(1, unit).check('[energy]'):
+        return f'`{unit}` is not a valid energy unit.'
+
+    return None
+
 
 class RecommendedCutoffMixin:
     """Mixin that adds support of recommended cutoffs to a ``Group`` subclass, using its extras.
@@ -33,6 +56,11 @@ class RecommendedCutoffMixin:
     _key_cutoffs_unit = '_cutoffs_unit'
     _key_default_stringency = '_default_stringency'
 
+    # Class-level defaults of the caches of the extras, which are shadowed by instance attributes once they are filled.
+    _cutoffs = None
+    _cutoffs_unit = None
+    _cutoffs_by_key = None
+
     @staticmethod
     def validate_cutoffs(elements: set, cutoffs: dict) -> None:
         """Validate a cutoff dictionary for a given set of elements.
@@ -57,19 +85,23 @@ class RecommendedCutoffMixin:
         """
         elements_family = set(elements)
 
-        elements_cutoffs = set(cutoffs.keys())
-        elements_diff = elements_family ^ elements_cutoffs
+        elements_unsupported = cutoffs.keys() - elements_family
+        elements_missing = elements_family - cutoffs.keys()
 
-        if elements_family < elements_cutoffs:
-            raise ValueError(f'cutoffs defined for unsupported elements: {elements_diff}')
+        if elements_unsupported:
+            raise ValueError(f'cutoffs defined for unsupported elements: {elements_unsupported}')
 
-        if elements_family > elements_cutoffs:
-            raise ValueError(f'cutoffs not defined for all family elements: {elements_diff}')
+        if elements_missing:
+            raise ValueError(f'cutoffs not defined for all family elements: {elements_missing}')
 
         for element, values in cutoffs.items():
-            if set(values.keys()) != {'cutoff_wfc', 'cutoff_rho'}:
+            if values.keys() != CUTOFF_KEYS:
                 raise ValueError(f'invalid cutoff keys for element {element}: {values}')
 
+            # Cutoffs that are loaded from JSON are practically always floats, for which the exact type check suffices.
+            if type(values['cutoff_wfc']) is float and type(values['cutoff_rho']) is float:
+                continue
+
             if any(not isinstance(cutoff, (int, float)) for cutoff in values.values()):
                 raise ValueError(f'invalid cutoff values for element {element}: {values}')
 
@@ -83,11 +115,10 @@ class RecommendedCutoffMixin:
         """
         type_check(unit, str)
 
-        if unit not in U:
-            raise ValueError(f'`{unit}` is not a valid unit.')
+        error = _get_energy_unit_error(unit)
 
-        if not U.Quantity(1, unit).check('[energy]'):
-            raise ValueError(f'`{unit}` is not a valid energy unit.')
+        if error is not None:
+            raise ValueError(error)
 
     def validate_stringency(self, stringency: Optional[str]) -> None:
         """Validate a cutoff stringency.
@@ -99,27 +130,101 @@ class RecommendedCutoffMixin:
         :raises ValueError: if `stringency` is equal to `None` and the family defines no default stringency.
         :raises ValueError: if the family does not define cutoffs for the specified stringency.
         """
+        self._resolve_stringency(stringency)
+
+    def _resolve_stringency(self, stringency: Optional[str]) -> str:
+        """Validate a cutoff stringency and return it, or the default stringency if no stringency is passed.
+
+        :param stringency: the cutoff stringency to validate.
+        :return: the validated stringency or the default stringency of the family if ``stringency`` is ``None``.
+        :raises ValueError: if `stringency` is equal to `None` and the family defines no default stringency.
+        :raises ValueError: if the family does not define cutoffs for the specified stringency.
+        """
         if stringency is None:
-            self.get_default_stringency()
-        elif stringency not in self.get_cutoff_stringencies():
+            return self.get_default_stringency()
+
+        if stringency not in self._get_cutoffs_dict():
             raise ValueError(
                 f'stringency `{stringency}` is not one of the available cutoff stringencies for this family: '
                 f'{self.get_cutoff_stringencies()}.'
             )
 
+        return stringency
+
     def _get_cutoffs_dict(self) -> dict:
         """Return the cutoffs dictionary that maps the stringencies to the recommended cutoffs.
 
+        .. note:: reading an extra of a stored group queries the database and returns a deep copy of the value, so the
+            cutoffs are cached on the instance. The cache is reset by ``set_cutoffs`` and ``delete_cutoffs``. The
+            returned dictionary is the cache itself, so it should never be modified or returned from a public method.
+
         :return: the cutoffs extra or an empty dictionary if it has not yet been set.
         """
-        return self.base.extras.get(self._key_cutoffs, {})
+        if self._cutoffs is None:
+            self._cutoffs = self.base.extras.get(self._key_cutoffs, {})
+
+        return self._cutoffs
 
     def _get_cutoffs_unit_dict(self) -> dict:
         """Return the cutoffs units for each of the stringencies.
 
+        .. note:: the units are cached on the instance for the same reason as the cutoffs in ``_get_cutoffs_dict``.
+
         :return: the cutoffs units extra or an empty dictionary if it has not yet been set.
         """
-        return self.base.extras.get(self._key_cutoffs_unit, {})
+        if self._cutoffs_unit is None:
+            self._cutoffs_unit = self.base.extras.get(self._key_cutoffs_unit, {})
+
+        return self._cutoffs_unit
+
+    def _get_cutoffs_by_key(self, stringency: str) -> tuple:
+        """Return the recommended cutoffs of a stringency as separate dictionaries for the wave functions and density.
+
+        The cutoffs are stored as a dictionary of cutoffs per element, but to find the maximum cutoffs for a number of
+        elements it is more efficient to have a flat dictionary of elements to cutoffs for each of the cutoff keys. The
+        result is cached on the instance per stringency and reset together with the cached cutoffs dictionary.
+
+        :param stringency: the stringency, which should be defined for the family.
+        :return: tuple of dictionaries that map the elements on the ``cutoff_wfc`` and ``cutoff_rho``, respectively.
+        """
+        if self._cutoffs_by_key is None:
+            self._cutoffs_by_key = {}
+
+        try:
+            return self._cutoffs_by_key[stringency]
+        except KeyError:
+            pass
+
+        cutoffs = self._get_cutoffs_dict()[stringency]
+        cutoffs_wfc = {element: values['cutoff_wfc'] for element, values in cutoffs.items()}
+        cutoffs_rho = {element: values['cutoff_rho'] for element, values in cutoffs.items()}
+        self._cutoffs_by_key[stringency] = (cutoffs_wfc, cutoffs_rho)
+
+        return self._cutoffs_by_key[stringency]
+
+    def _set_cutoffs_dicts(
+        self, cutoffs_dict: dict, cutoffs_unit_dict: dict, default_stringency: Optional[str] = None
+    ) -> None:
+        """Store the cutoffs and cutoffs units dictionaries in the extras and reset the cached values.
+
+        The extras are set in a single call, which for a stored group means a single write to the database.
+
+        :param cutoffs_dict: the cutoffs dictionary that maps the stringencies to the recommended cutoffs.
+        :param cutoffs_unit_dict: the dictionary that maps the stringencies to the cutoffs units.
+        :param default_stringency: optional default stringency to set along with the cutoffs. It should be one of the
+            stringencies of ``cutoffs_dict``, which is not validated.
+        """
+        extras = {self._key_cutoffs: cutoffs_dict, self._key_cutoffs_unit: cutoffs_unit_dict}
+
+        if default_stringency is not None:
+            extras[self._key_default_stringency] = default_stringency
+
+        try:
+            self.base.extras.set_many(extras)
+        finally:
+            self._cutoffs = None
+            self._cutoffs_unit = None
+            self._cutoffs_by_key = None
 
     def get_default_stringency(self) -> str:
         """Return the default stringency if defined.
@@ -184,16 +289,12 @@ class RecommendedCutoffMixin:
         self.validate_cutoffs(set(self.elements), cutoffs)
         self.validate_cutoffs_unit(unit)
 
-        cutoffs_dict = self._get_cutoffs_dict()
-        cutoffs_dict[stringency] = cutoffs
-
-        cutoffs_unit_dict = self._get_cutoffs_unit_dict()
-        cutoffs_unit_dict[stringency] = unit
+        cutoffs_dict = {**self._get_cutoffs_dict(), stringency: cutoffs}
+        cutoffs_unit_dict = {**self._get_cutoffs_unit_dict(), stringency: unit}
 
-        self.base.extras.set(self._key_cutoffs, cutoffs_dict)
-        self.base.extras.set(self._key_cutoffs_unit, cutoffs_unit_dict)
-        if len(cutoffs_dict) == 1:
-            self.set_default_stringency(stringency)
+        # If this is the only stringency, it is set as the default in the same write as the cutoffs themselves.
+        default_stringency = stringency if len(cutoffs_dict) == 1 else None
+        self._set_cutoffs_dicts(cutoffs_dict, cutoffs_unit_dict, default_stringency)
 
     def get_cutoffs(self, stringency: Optional[str] = None) -> dict:
         """Return a set of cutoffs for the given stringency.
@@ -203,9 +304,8 @@ class RecommendedCutoffMixin:
         :raises ValueError: if no stringency is specified and no default stringency is defined for the family.
         :raises ValueError: if the requested stringency is not defined for this family.
         """
-        self.validate_stringency(stringency)
-        stringency = stringency or self.get_default_stringency()
-        return self._get_cutoffs_dict()[stringency]
+        # A copy is returned, such that modifying the cutoffs does not affect the cached cutoffs dictionary.
+        return copy.deepcopy(self._get_cutoffs_dict()[self._resolve_stringency(stringency)])
 
     def delete_cutoffs(self, stringency: str) -> None:
         """Delete the recommended cutoffs for a specified stringency.
@@ -219,41 +319,47 @@ class RecommendedCutoffMixin:
         """
         self.validate_stringency(stringency)
 
-        cutoffs_dict = self._get_cutoffs_dict()
+        try:
+            default_stringency = self.get_default_stringency()
+        except ValueError:
+            default_stringency = None
+
+        cutoffs_dict = dict(self._get_cutoffs_dict())
         cutoffs_dict.pop(stringency)
 
-        cutoffs_unit_dict = self._get_cutoffs_unit_dict()
+        cutoffs_unit_dict = dict(self._get_cutoffs_unit_dict())
         cutoffs_unit_dict.pop(stringency)
 
-        self.base.extras.set(self._key_cutoffs, cutoffs_dict)
-        self.base.extras.set(self._key_cutoffs_unit, cutoffs_unit_dict)
+        is_default = stringency == default_stringency
+        assign_new_default = is_default or default_stringency is None
 
-        warning = ''
-        try:
-            if stringency == self.get_default_stringency():
-                self.delete_extra('_default_stringency')
-                warning += f'`{stringency}` was the default stringency of this family.'
-                assign_new_default = True
-            else:
-                assign_new_default = False
-        except ValueError:
-            assign_new_default = True
-
-        if assign_new_default:
-            if len(cutoffs_dict) == 0:
-                warning += ' Since no other stringencies are defined for this family, no new default can be specified.'
-            elif len(cutoffs_dict) == 1:
-                final_stringency = next(iter(cutoffs_dict.keys()))
-                self.set_default_stringency(final_stringency)
-                warning += f' Setting `{final_stringency}` as the default since it is now the only defined stringency.'
-            else:
-                warning += (
-                    f' Please set one of {self.get_cutoff_stringencies()} as the new default stringency with the '
-                    '`set_default_stringency` method.'
-                )
-
-        if len(warning) > 0:
-            warnings.warn(warning)
+        # If a single stringency remains, it becomes the new default, which is set in the same write as the cutoffs.
+        if assign_new_default and len(cutoffs_dict) == 1:
+            new_default_stringency = next(iter(cutoffs_dict))
+        else:
+            new_default_stringency = None
+
+        self._set_cutoffs_dicts(cutoffs_dict, cutoffs_unit_dict, new_default_stringency)
+
+        if not assign_new_default:
+            return
+
+        if is_default and new_default_stringency is None:
+            self.base.extras.delete(self._key_default_stringency)
+
+        reason = f'`{stringency}` was the default stringency of this family.' if is_default else ''
+
+        if not cutoffs_dict:
+            advice = ' Since no other stringencies are defined for this family, no new default can be specified.'
+        elif new_default_stringency is not None:
+            advice = f' Setting `{new_default_stringency}` as the default since it is now the only defined stringency.'
+        else:
+            advice = (
+                f' Please set one of {tuple(cutoffs_dict)} as the new default stringency with the '
+                '`set_default_stringency` method.'
+            )
+
+        warnings.warn(f'{reason}{advice}')
 
     def get_cutoffs_unit(self, stringency: Optional[str] = None) -> str:
         """Return the cutoffs unit for the specified or family default stringency.
@@ -264,9 +370,7 @@ class RecommendedCutoffMixin:
         :raises ValueError: if no stringency is specified and no default stringency is defined for the family.
         :raises ValueError: if the requested stringency is not defined for this family.
         """
-        self.validate_stringency(stringency)
-        stringency = stringency or self.get_default_stringency()
-        return self._get_cutoffs_unit_dict()[stringency]
+        return self._get_cutoffs_unit_dict()[self._resolve_stringency(stringency)]
 
     def get_recommended_cutoffs(self, *, elements=None, structure=None, stringency=None, unit=None):
         """Return tuple of recommended wavefunction and density cutoffs for the given elements or ``StructureData``.
@@ -285,34 +389,41 @@ class RecommendedCutoffMixin:
         if (elements is None and structure is None) or (elements is not None and structure is not None):
             raise ValueError('at least one and only one of `elements` or `structure` should be defined')
 
-        type_check(elements, (tuple, str), allow_none=True)
-        type_check(structure, (structures_classes), allow_none=True)
-
-        if unit is not None:
-            self.validate_cutoffs_unit(unit)
-
         if structure is not None:
+            if not isinstance(structure, structures_classes):
+                raise TypeError(f'Got object of type {type(structure)}, expecting {structures_classes}')
             symbols = structure.get_symbols_set()
+        elif isinstance(elements, str):
+            symbols = (elements,)
         elif isinstance(elements, tuple):
-            symbols = elements
+            # Duplicate elements do not affect the maximum cutoffs, so they are dropped while keeping the order such
+            # that the first element that is not supported is the one that is reported.
+            symbols = dict.fromkeys(elements)
         else:
-            symbols = (elements,)
+            raise TypeError(f'Got object of type {type(elements)}, expecting {(tuple, str)}')
 
-        cutoffs_wfc = []
-        cutoffs_rho = []
-        cutoffs = self.get_cutoffs(stringency)
+        if unit is not None:
+            self.validate_cutoffs_unit(unit)
+
+        stringency = self._resolve_stringency(stringency)
+        cutoffs_wfc, cutoffs_rho = self._get_cutoffs_by_key(stringency)
 
         for element in symbols:
-            if element not in cutoffs:
+            if element not in cutoffs_wfc:
                 raise ValueError(f'family does not contain a pseudo for element `{element}`.')
 
-            if unit is not None:
-                current_unit = self.get_cutoffs_unit(stringency)
-                values = {k: U.Quantity(v, current_unit).to(unit).to_tuple()[0] for k, v in cutoffs[element].items()}
-            else:
-                values = cutoffs[element]
+        cutoff_wfc = max(map(cutoffs_wfc.__getitem__, symbols))
+        cutoff_rho = max(map(cutoffs_rho.__getitem__, symbols))
+
+        # Energy units are multiplicative, so ``pint`` converts a value by multiplying it with the conversion factor of
+        # the units. Since that factor is positive, only the maximum cutoffs have to be converted, which gives the exact
+        # same values as converting each cutoff as a separate ``Quantity``, which is expensive. If the requested unit is
+        # the one that the cutoffs are stored in, there is nothing to convert and ``pint`` is not invoked at all.
+        current_unit = self._get_cutoffs_unit_dict()[stringency]
 
-            cutoffs_wfc.append(values['cutoff_wfc'])
-            cutoffs_rho.append(values['cutoff_rho'])
+        if unit is not None and unit != current_unit:
+            factor = U.Quantity(1, current_unit).to(unit).to_tuple()[0]
+            cutoff_wfc *= factor
+            cutoff_rho *= factor
 
-        return (max(cutoffs_wfc), max(cutoffs_rho))
+        return (cutoff_wfc, cutoff_rho)
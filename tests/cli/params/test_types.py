@@ -24,3 +24,46 @@ def test_pseudo_family_type_param_complete(ctx):
     assert isinstance(param.complete(ctx, ''), list)
     assert isinstance(param.complete(ctx, 'pseudo'), list)
     assert ('pseudo.family', '') in param.complete(ctx, 'pseudo')
+
+
+@pytest.mark.parametrize('with_context', (True, False))
+def test_path_or_url_convert_url(monkeypatch, with_context):
+    """Test the `PathOrUrl.convert` method removes the temporary file of a downloaded URL, with or without context."""
+    import atexit
+
+    callbacks = []
+
+    class Response:
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *_):
+            pass
+
+        def raise_for_status(self):
+            pass
+
+        def iter_content(self, chunk_size):
+            yield b'content'
+
+    class Session:
+        def get(self, *_, **__):
+            return Response()
+
+    monkeypatch.setattr(types, 'get_session', Session)
+    monkeypatch.setattr(atexit, 'register', lambda function, **kwargs: callbacks.append((function, kwargs)))
+
+    param = types.PathOrUrl(exists=True)
+
+    if with_context:
+        with click.Context(click.Command('command')) as context:
+            filepath = param.convert('https://example.com/non-existing', None, context)
+            assert filepath.read_bytes() == b'content'
+    else:
+        filepath = param.convert('https://example.com/non-existing', None, None)
+        assert filepath.read_bytes() == b'content'
+
+        for function, kwargs in callbacks:
+            function(**kwargs)
+
+    assert not filepath.exists()
@@ -210,14 +210,21 @@ def test_family_show_unit(aiida_profile_clean, run_cli_command, get_pseudo_famil
 
     family = get_pseudo_family(cls=CutoffsPseudoPotentialFamily, elements=elements, cutoffs_dict=cutoff_dict, unit='Ry')
 
-    # Test both option strings and several units
-    for option in ['-u', '--unit']:
-        result = run_cli_command(cmd_family_show, [family.label, option, unit])
-        cutoffs = family.get_recommended_cutoffs(elements='Ar', unit=unit)
-        header_fields = result.output_lines[0].split()
-        assert header_fields[4] == f'({unit})'
-        assert header_fields[4] == f'({unit})'
-
-        values_fields = result.output_lines[2].split()
-        assert round(cutoffs[0], 1) == float(values_fields[3])
-        assert round(cutoffs[1], 1) == float(values_fields[4])
+    result = run_cli_command(cmd_family_show, [family.label, '--unit', unit])
+    cutoffs = family.get_recommended_cutoffs(elements='Ar', unit=unit)
+    header_fields = result.output_lines[0].split()
+    assert header_fields[4] == f'({unit})'
+    assert header_fields[7] == f'({unit})'
+
+    values_fields = result.output_lines[2].split()
+    assert round(cutoffs[0], 1) == float(values_fields[3])
+    assert round(cutoffs[1], 1) == float(values_fields[4])
+
+
+def test_family_show_unit_short_option(aiida_profile_clean, run_cli_command, get_pseudo_family):
+    """Test the `-u` short option string of the `-u/--unit` option."""
+    cutoff_dict = {'normal': {'Ar': {'cutoff_wfc': 50, 'cutoff_rho': 200}}}
+    family = get_pseudo_family(cls=CutoffsPseudoPotentialFamily, elements=['Ar'], cutoffs_dict=cutoff_dict, unit='Ry')
+
+    result = run_cli_command(cmd_family_show, [family.label, '-u', 'eV'])
+    assert result.output_lines[0].split()[4] == '(eV)'
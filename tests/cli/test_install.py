@@ -1,7 +1,11 @@
 """Tests for `aiida-pseudo install`."""
 import contextlib
+import functools
+import hashlib
+import io
 import json
 import pathlib
+import tarfile
 
 import pytest
 from aiida.manage.configuration.config import Config
@@ -13,6 +17,34 @@ from aiida_pseudo.groups.family.pseudo_dojo import PseudoDojoConfiguration, Pseu
 from aiida_pseudo.groups.family.sssp import SsspConfiguration, SsspFamily
 
 
+@functools.lru_cache(maxsize=None)
+def read_pseudo(filepath: pathlib.Path) -> tuple:
+    """Return the content and md5 checksum of a pseudopotential file.
+
+    The monkeypatched download functions use the same few fixture files over and over, so the result is cached.
+
+    :param filepath: absolute filepath of the pseudopotential file.
+    :return: tuple of the content of the file and its md5 checksum.
+    """
+    content = filepath.read_bytes()
+    return content, hashlib.md5(content).hexdigest()
+
+
+def write_archive(filepath: pathlib.Path, files: dict) -> None:
+    """Write a gzipped tar archive with the given files.
+
+    The archives are only unpacked by the install commands, so the fastest compression level is used.
+
+    :param filepath: absolute filepath to write the archive to.
+    :param files: dictionary mapping the filenames of the archive on their content in bytes.
+    """
+    with tarfile.open(filepath, 'w:gz', compresslevel=1) as archive:
+        for filename, content in files.items():
+            tarinfo = tarfile.TarInfo(filename)
+            tarinfo.size = len(content)
+            archive.addfile(tarinfo, io.BytesIO(content))
+
+
 @contextlib.contextmanager
 def empty_config() -> Config:
     """Provide a temporary empty configuration.
@@ -60,7 +92,7 @@ def empty_config() -> Config:
 
 
 @pytest.fixture
-def run_monkeypatched_install_sssp(run_cli_command, filepath_pseudos, monkeypatch, tmp_path):
+def run_monkeypatched_install_sssp(run_cli_command, filepath_pseudos, monkeypatch):
     """Fixture to monkeypatch the ``aiida_pseudo.cli.install.download_sssp`` method and call the install cmd."""
 
     def download_sssp(
@@ -68,6 +100,7 @@ def run_monkeypatched_install_sssp(run_cli_command, filepath_pseudos, monkeypatc
         filepath_archive: pathlib.Path,
         filepath_metadata: pathlib.Path,
         traceback: bool = False,
+        cache: bool = True,
     ) -> None:
         """Download the pseudopotential archive and metadata for an SSSP configuration to a path on disk.
 
@@ -75,18 +108,13 @@ def run_monkeypatched_install_sssp(run_cli_command, filepath_pseudos, monkeypatc
         :param filepath_archive: absolute filepath to write the pseudopotential archive to.
         :param filepath_metadata: absolute filepath to write the metadata file to.
         :param traceback: boolean, if true, print the traceback when an exception occurs.
+        :param cache: boolean, if true, use the download cache for the archive and metadata.
         """
-        import hashlib
-        import shutil
-
         element = 'Ar'
         entry_point = 'upf'
         filepath_pseudo = filepath_pseudos(entry_point) / f'{element}.{entry_point}'
-        (tmp_path / filepath_pseudo.name).write_bytes(filepath_pseudo.read_bytes())
-        md5 = hashlib.md5(filepath_pseudo.read_bytes()).hexdigest()
-
-        filename_archive = shutil.make_archive('temparchive', 'gztar', root_dir=tmp_path, base_dir='.')
-        shutil.move(pathlib.Path.cwd() / filename_archive, filepath_archive)
+        content, md5 = read_pseudo(filepath_pseudo)
+        write_archive(filepath_archive, {filepath_pseudo.name: content})
 
         with open(filepath_metadata, 'w', encoding='utf-8') as handle:
             data = {element: {'md5': md5, 'cutoff_wfc': 60.0, 'cutoff_rho': 240.0}}
@@ -101,7 +129,7 @@ def run_monkeypatched_install_sssp(run_cli_command, filepath_pseudos, monkeypatc
 
 
 @pytest.fixture
-def run_monkeypatched_install_pseudo_dojo(run_cli_command, filepath_pseudos, monkeypatch, tmp_path):
+def run_monkeypatched_install_pseudo_dojo(run_cli_command, filepath_pseudos, monkeypatch):
     """Fixture to monkeypatch the ``aiida_pseudo.cli.install.download_pseudo_dojo`` method and call the install cmd."""
 
     def download_pseudo_dojo(
@@ -109,6 +137,7 @@ def run_monkeypatched_install_pseudo_dojo(run_cli_command, filepath_pseudos, mon
         filepath_archive: pathlib.Path,
         filepath_metadata: pathlib.Path,
         traceback: bool = False,
+        cache: bool = True,
     ) -> None:
         """Download the pseudopotential archive and metadata for a PseudoDojo configuration to a path on disk.
 
@@ -116,29 +145,16 @@ def run_monkeypatched_install_pseudo_dojo(run_cli_command, filepath_pseudos, mon
         :param filepath_archive: absolute filepath to write the pseudopotential archive to.
         :param filepath_metadata: absolute filepath to write the metadata archive to.
         :param traceback: boolean, if true, print the traceback when an exception occurs.
+        :param cache: boolean, if true, use the download cache for the archive and metadata.
         """
-        import hashlib
-        import shutil
-
         element = 'Ar'
         entry_point = 'jthxml'
         filepath_pseudo = filepath_pseudos(entry_point) / f'{element}.{entry_point}'
-        (tmp_path / filepath_pseudo.name).write_bytes(filepath_pseudo.read_bytes())
-        md5 = hashlib.md5(filepath_pseudo.read_bytes()).hexdigest()
-
-        filename_archive = shutil.make_archive('temparchive', 'gztar', root_dir=tmp_path, base_dir='.')
-        shutil.move(pathlib.Path.cwd() / filename_archive, filepath_archive)
+        content, md5 = read_pseudo(filepath_pseudo)
+        write_archive(filepath_archive, {filepath_pseudo.name: content})
 
         data = {'hints': {'high': {'ecut': 20.00}, 'low': {'ecut': 20.00}, 'normal': {'ecut': 20.00}}, 'md5': md5}
-
-        filepath_djrepo = tmp_path / f'{element}.djrepo'
-
-        with open(filepath_djrepo, 'w', encoding='utf-8') as handle:
-            json.dump(data, handle)
-            handle.flush()
-
-        filename_metadata = shutil.make_archive('tempmetadata', 'gztar', root_dir=tmp_path, base_dir='.')
-        shutil.move(pathlib.Path.cwd() / filename_metadata, filepath_metadata)
+        write_archive(filepath_metadata, {f'{element}.djrepo': json.dumps(data).encode('utf-8')})
 
     def _run_monkeypatched_install_pseudo_dojo(options=None, raises=None):
         monkeypatch.setattr(install, 'download_pseudo_dojo', download_pseudo_dojo)
@@ -191,8 +207,7 @@ def test_install_family_url(run_cli_command, get_pseudo_archive, monkeypatch):
     by having to download data from the web, but most importantly it is susceptible to random failures if the remote
     URL is (temporarily) not availabe, or even permanently goes offline, or even the content changes. That is why we
     monkeypatch the ``PathOrUrl`` instead to simply return the content of an archive that is created on the fly on the
-    local disk. The command expects that the parameter type returns an object that contains the content of the archive
-    under the ``content`` attribute. To mimick this, we construct a namedtuple with a ``content`` attribute on the fly.
+    local disk. The command expects that the parameter type returns the filepath of the downloaded archive.
     """
     from aiida_pseudo.cli.params.types import PathOrUrl
 
@@ -203,11 +218,7 @@ def test_install_family_url(run_cli_command, get_pseudo_archive, monkeypatch):
     options = ['-D', description, '-P', 'pseudo.upf', '-f', fmt, filepath_archive, label]
 
     def convert(*_, **__):
-        from collections import namedtuple
-
-        Archive = namedtuple('Archive', ['content'])
-        archive = Archive(get_pseudo_archive(fmt=fmt).read_bytes())
-        return archive
+        return get_pseudo_archive(fmt=fmt)
 
     monkeypatch.setattr(PathOrUrl, 'convert', convert)
 
@@ -308,6 +319,23 @@ def test_install_pseudo_dojo_monkeypatched(run_monkeypatched_install_pseudo_dojo
     assert family.label == label
 
 
+@pytest.mark.usefixtures('aiida_profile_clean')
+def test_install_sssp_missing_element(filepath_pseudos, tmp_path):
+    """Test ``install_sssp`` fails if the metadata defines an element for which the archive contains no pseudo."""
+    content, md5 = read_pseudo(filepath_pseudos('upf') / 'Ar.upf')
+    filepath_archive = tmp_path / 'archive.tar.gz'
+    filepath_metadata = tmp_path / 'metadata.json'
+
+    write_archive(filepath_archive, {'Ar.upf': content})
+    metadata = {element: {'md5': md5, 'cutoff_wfc': 60.0, 'cutoff_rho': 240.0} for element in ('Ar', 'Kr')}
+    filepath_metadata.write_text(json.dumps(metadata))
+
+    with pytest.raises(SystemExit):
+        install.install_sssp(filepath_archive, filepath_metadata, 'SSSP/1.3/PBE/efficiency')
+
+    assert SsspFamily.collection.count() == 0
+
+
 @pytest.mark.usefixtures('aiida_profile_clean', 'chdir_tmp_path')
 def test_install_sssp_download_only(run_monkeypatched_install_sssp):
     """Test the ``aiida-pseudo install sssp`` command with the ``--download-only`` option.
@@ -460,3 +488,53 @@ def test_install_pseudo_dojo_from_download(run_monkeypatched_install_pseudo_dojo
     result = run_monkeypatched_install_pseudo_dojo(options=options)
     assert PseudoDojoFamily.collection.count() == 1
     assert 'Success: installed `PseudoDojo' in result.output
+
+
+@pytest.mark.parametrize(
+    ('version', 'expected'),
+    (
+        ('1.0', '1.0.0'),
+        ('1.2', '1.2.1'),
+        ('1.3', '1.3.0'),
+    ),
+)
+def test_get_patch_version(version, expected):
+    """Test the ``get_patch_version`` function."""
+    content = b"'1.0': 1.0.0\n'1.1': {'nested': 1.1.0}\n'1.2': '1.2.1'\n'1.3': 1.3.0\n"
+    assert install.get_patch_version(content, version) == expected
+
+
+def test_get_patch_version_missing():
+    """Test the ``get_patch_version`` function raises if the minor version is not defined or not a scalar."""
+    content = b"'1.0': 1.0.0\n'1.1': {'nested': 1.1.0}\n"
+
+    with pytest.raises(KeyError):
+        install.get_patch_version(content, '1.1')
+
+    with pytest.raises(KeyError):
+        install.get_patch_version(content, '2.0')
+
+
+def test_write_download_archive(tmp_path):
+    """Test the ``write_download_archive`` function."""
+    filepath = tmp_path / 'file'
+    filepath.write_bytes(b'content')
+    tarball_path = tmp_path / 'archive.tar.gz'
+
+    install.write_download_archive(tarball_path, (filepath,))
+
+    with tarfile.open(tarball_path) as archive:
+        assert archive.getnames() == ['file']
+
+    assert not (tmp_path / 'archive.tar.gz.part').exists()
+
+
+def test_write_download_archive_failed(tmp_path):
+    """Test the ``write_download_archive`` function removes the partial tarball if it cannot be written."""
+    tarball_path = tmp_path / 'archive.tar.gz'
+
+    with pytest.raises(FileNotFoundError):
+        install.write_download_archive(tarball_path, (tmp_path / 'missing',))
+
+    assert not tarball_path.exists()
+    assert not (tmp_path / 'archive.tar.gz.part').exists()
@@ -4,7 +4,7 @@ import tarfile
 import tempfile
 
 import pytest
-from aiida_pseudo.cli.utils import attempt, create_family_from_archive
+from aiida_pseudo.cli.utils import attempt, create_family_from_archive, get_scratch_dirpath, unpack_archive
 from aiida_pseudo.groups.family import PseudoPotentialFamily
 
 
@@ -78,3 +78,91 @@ def test_attempt_exception_traceback(capsys):
     assert captured.out == f'Report: {message} [FAILED]\n'
     assert captured.err.startswith(f'Critical: {exception}\n')
     assert 'Traceback' in captured.err
+
+
+def test_unpack_archive_without_extension(tmp_path, filepath_pseudos):
+    """Test the `unpack_archive` utility function detects tar archives from their content."""
+    filepath_archive = tmp_path / 'archive'
+    dirpath = tmp_path / 'unpacked'
+    dirpath.mkdir()
+
+    with tarfile.open(filepath_archive, 'w:gz') as tar:
+        tar.add(filepath_pseudos('upf') / 'Ar.upf', arcname='Ar.upf')
+
+    unpack_archive(filepath_archive, dirpath)
+    assert (dirpath / 'Ar.upf').read_bytes() == (filepath_pseudos('upf') / 'Ar.upf').read_bytes()
+
+
+def test_download_cache(tmp_path, monkeypatch):
+    """Test the `download` utility function reuses the cached content if the server reports it unchanged."""
+    import requests
+    from aiida_pseudo.cli.utils import download
+
+    url = 'https://example.com/archive.tar.gz'
+    content = b'content'
+    requests_headers = []
+    responses_open = []
+
+    class Response:
+        def __init__(self, headers):
+            # A new request should only be made once the response of any previous request has been closed.
+            assert not responses_open
+            requests_headers.append(headers)
+            self.status_code = 304 if headers.get('If-None-Match') == 'etag' else 200
+            self.content = b'' if self.status_code == 304 else content
+            self.headers = {'ETag': 'etag'}
+
+        def __enter__(self):
+            responses_open.append(self)
+            return self
+
+        def __exit__(self, *_):
+            responses_open.remove(self)
+
+        def raise_for_status(self):
+            pass
+
+        def iter_content(self, chunk_size):
+            for index in range(0, len(self.content), chunk_size):
+                yield self.content[index : index + chunk_size]
+
+    monkeypatch.setenv('XDG_CACHE_HOME', str(tmp_path / 'cache'))
+    monkeypatch.setattr(requests.Session, 'get', lambda self, url, headers, **kwargs: Response(headers))
+
+    download(url, tmp_path / 'first')
+    download(url, tmp_path / 'second')
+    download(url, tmp_path / 'third', cache=False)
+
+    assert requests_headers == [{}, {'If-None-Match': 'etag'}, {}]
+    assert (tmp_path / 'first').read_bytes() == content
+    assert (tmp_path / 'second').read_bytes() == content
+    assert (tmp_path / 'third').read_bytes() == content
+
+    # Only the cached content and its ``ETag`` should remain in the cache, without any temporary files.
+    dirpath_cache = tmp_path / 'cache' / 'aiida-pseudo'
+    filepaths_cache = [path for path in dirpath_cache.iterdir() if path.suffix != '.etag']
+    assert len(filepaths_cache) == 1
+    assert filepaths_cache[0].read_bytes() == content
+    assert len(list(dirpath_cache.iterdir())) == 2
+
+    # If the cached content is missing, the content should be downloaded again after the server reports it unchanged.
+    filepaths_cache[0].unlink()
+    download(url, tmp_path / 'fourth')
+
+    assert requests_headers[3:] == [{'If-None-Match': 'etag'}, {}]
+    assert (tmp_path / 'fourth').read_bytes() == content
+
+    # If the download cache cannot be created, the content should be downloaded without it.
+    (tmp_path / 'file').touch()
+    monkeypatch.setenv('XDG_CACHE_HOME', str(tmp_path / 'file'))
+    download(url, tmp_path / 'fifth')
+
+    assert requests_headers[5:] == [{}]
+    assert (tmp_path / 'fifth').read_bytes() == content
+
+
+def test_get_scratch_dirpath(tmp_path, monkeypatch):
+    """Test the `get_scratch_dirpath` utility function."""
+    monkeypatch.setenv('XDG_RUNTIME_DIR', str(tmp_path))
+    assert get_scratch_dirpath(0) in ('/dev/shm', str(tmp_path))
+    assert get_scratch_dirpath(2**62) is None
@@ -66,7 +66,7 @@ def run_cli_command():
     return _run_cli_command
 
 
-@pytest.fixture
+@pytest.fixture(scope='session')
 def filepath_fixtures() -> pathlib.Path:
     """Return the absolute filepath to the directory containing the file `fixtures`.
 
@@ -75,7 +75,7 @@ def filepath_fixtures() -> pathlib.Path:
     return pathlib.Path(__file__).parent.resolve() / 'fixtures'
 
 
-@pytest.fixture
+@pytest.fixture(scope='session')
 def filepath_pseudos(filepath_fixtures):
     """Return the absolute filepath to the directory containing the pseudo potential files.
 
@@ -200,14 +200,22 @@ def get_pseudo_family(tmp_path, filepath_pseudos):
     return _get_pseudo_family
 
 
-@pytest.fixture
-def get_pseudo_archive(tmp_path, filepath_pseudos):
-    """Create an archive with pseudos."""
+@pytest.fixture(scope='session')
+def get_pseudo_archive(tmp_path_factory, filepath_pseudos):
+    """Create an archive with pseudos.
+
+    The archives are only ever read by the tests, so each format is created just once per session.
+    """
+    archives = {}
 
     def _get_pseudo_archive(fmt='gztar'):
-        shutil.make_archive(tmp_path / 'archive', fmt, filepath_pseudos('upf'))
-        # The created archive should be the only file in ``tmp_path`` so just get first entry from the iterator.
-        return next(iter(tmp_path.iterdir()))
+        if fmt not in archives:
+            dirpath = tmp_path_factory.mktemp('archive')
+            shutil.make_archive(dirpath / 'archive', fmt, filepath_pseudos('upf'))
+            # The created archive should be the only file in ``dirpath`` so just get first entry from the iterator.
+            archives[fmt] = next(iter(dirpath.iterdir()))
+
+        return archives[fmt]
 
     return _get_pseudo_archive
 
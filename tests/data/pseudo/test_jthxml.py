@@ -5,6 +5,7 @@ import pathlib
 import pytest
 from aiida.common.exceptions import ModificationNotAllowed
 from aiida_pseudo.data.pseudo import JthXmlData
+from aiida_pseudo.data.pseudo.jthxml import parse_element
 
 
 @pytest.fixture
@@ -58,3 +59,43 @@ def test_set_file(filepath_pseudos, get_pseudo_potential_data):
 
         with pytest.raises(ModificationNotAllowed):
             pseudo.set_file(handle)
+
+
+@pytest.mark.parametrize(
+    'content',
+    (
+        b'<paw_dataset><atom note="a>b" symbol="fe" Z="26"/></paw_dataset>',
+        b'<paw_dataset><!-- <atom symbol="Xx"/> --><atom symbol="fe" Z="26"/></paw_dataset>',
+        b'<paw_dataset><atom nsymbol="Xx" symbol="fe" Z="26"/></paw_dataset>',
+        b'<paw_dataset><atom symbol="&#70;e" Z="26"/></paw_dataset>',
+    ),
+)
+def test_parse_element_fast_path_fallback(content):
+    """Test the parsing of content for which the regular expression of the fast path is insufficient."""
+    assert parse_element(io.BytesIO(content)) == 'Fe'
+
+
+@pytest.mark.parametrize('padding', (b'', b' ' * 8192))
+@pytest.mark.parametrize('tag', ('atom', 'jth:atom'))
+def test_parse_element_tag(padding, tag):
+    """Test the parsing of the ``atom`` tag, optionally with a namespace prefix.
+
+    With the padding, the tag is not in the head of the content that is searched with the regular expression, such
+    that the content has to be parsed as XML.
+    """
+    content = b'<paw_dataset xmlns:jth="urn:jth">' + padding + f'<{tag} symbol="ar" Z="18"/></paw_dataset>'.encode()
+    assert parse_element(io.BytesIO(content)) == 'Ar'
+
+
+@pytest.mark.parametrize(
+    'content, message',
+    (
+        (b'<paw_dataset><atom', r'could not parse the element from the XML content: .*'),
+        (b'<paw_dataset></paw_dataset>', r'could not parse the element from the XML content: the `atom` tag is not'),
+        (b'<paw_dataset><atom Z="18"/></paw_dataset>', r'could not parse the element from the XML content: .*'),
+    ),
+)
+def test_parse_element_invalid(content, message):
+    """Test that ``parse_element`` raises a ``ValueError`` for invalid content."""
+    with pytest.raises(ValueError, match=message):
+        parse_element(io.BytesIO(content))
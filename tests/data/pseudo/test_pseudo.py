@@ -8,6 +8,7 @@ from aiida.common.files import md5_from_filelike
 from aiida.common.links import LinkType
 from aiida.orm import CalcJobNode
 from aiida_pseudo.data.pseudo import PseudoPotentialData, UpfData
+from aiida_pseudo.data.pseudo.pseudo import md5_from_directory, md5_from_stream, parse_xml_tag_attributes
 
 
 @pytest.fixture
@@ -74,6 +75,20 @@ def test_constructor_filename(get_pseudo_potential_data, implicit, source_type):
         assert node.filename == explicit_filename
 
 
+@pytest.mark.parametrize(
+    'stream, expected',
+    (
+        (io.BytesIO(b'content'), True),
+        (io.BufferedReader(io.BytesIO(b'content')), True),
+        (io.StringIO('content'), False),
+        (b'content', False),
+    ),
+)
+def test_is_readable_byte_stream(stream, expected):
+    """Test the ``PseudoPotentialData.is_readable_byte_stream`` method."""
+    assert PseudoPotentialData.is_readable_byte_stream(stream) is expected
+
+
 @pytest.mark.parametrize(
     ('value, exception, pattern'),
     (
@@ -98,6 +113,68 @@ def test_prepare_source(source):
         assert PseudoPotentialData.prepare_source(source) is source
 
 
+@pytest.mark.parametrize('position', (0, 5))
+def test_md5_from_stream(position):
+    """Test the ``md5_from_stream`` function computes the checksum from the current position of the stream."""
+    content = b'content of the pseudo potential'
+    stream = io.BytesIO(content)
+    stream.seek(position)
+    expected = md5_from_filelike(io.BytesIO(content[position:]))
+
+    assert md5_from_stream(stream) == expected
+
+
+def test_md5_from_stream_file(tmp_path):
+    """Test the ``md5_from_stream`` function for a file handle."""
+    content = b'content of the pseudo potential'
+    filepath = tmp_path / 'pseudo'
+    filepath.write_bytes(content)
+
+    with filepath.open('rb') as handle:
+        assert md5_from_stream(handle) == md5_from_filelike(io.BytesIO(content))
+
+
+@pytest.mark.parametrize(
+    'content, expected',
+    (
+        (b'<root><tag key="value"/></root>', {'key': 'value'}),
+        (b'<root><ns:tag key="a>b"/></root>', {'key': 'a>b'}),
+        (b'<root><!-- <tag key="other"/> --><tag key="value"/></root>', {'key': 'value'}),
+        (b'<root><tag key="&#97;"/></root>', {'key': 'a'}),
+        (b'<root><other key="value"/></root>', None),
+    ),
+)
+def test_parse_xml_tag_attributes(content, expected):
+    """Test the ``parse_xml_tag_attributes`` function."""
+    assert parse_xml_tag_attributes(io.BytesIO(content), 'tag', ('key',)) == expected
+
+
+def test_md5_from_directory(tmp_path):
+    """Test the ``md5_from_directory`` function."""
+    (tmp_path / 'subdirectory').mkdir()
+    contents = {tmp_path / f'pseudo_{index}': f'content {index}'.encode('utf-8') for index in range(4)}
+
+    for filepath, content in contents.items():
+        filepath.write_bytes(content)
+
+    assert md5_from_directory(tmp_path) == {
+        filepath: md5_from_filelike(io.BytesIO(content)) for filepath, content in contents.items()
+    }
+
+
+def test_get_entry_point_name_unregistered():
+    """Test the ``PseudoPotentialData.get_entry_point_name`` method raises for an unregistered class."""
+
+    class UnregisteredData(PseudoPotentialData):
+        """Subclass of ``PseudoPotentialData`` that is not registered as an entry point."""
+
+    for _ in range(2):
+        with pytest.raises(AttributeError, match=r'the class `UnregisteredData` is not registered as an entry point.'):
+            UnregisteredData.get_entry_point_name()
+
+    assert '_entry_point_name' not in UnregisteredData.__dict__
+
+
 @pytest.mark.usefixtures('aiida_profile_clean')
 def test_store():
     """Test the `PseudoPotentialData.store` method."""
@@ -123,6 +200,36 @@ def test_store():
     assert pseudo.is_stored
 
 
+@pytest.mark.usefixtures('aiida_profile_clean')
+def test_store_verified_md5(monkeypatch):
+    """Test the `PseudoPotentialData.store` method does not validate an md5 that was already verified."""
+    pseudo = PseudoPotentialData(io.BytesIO(b'pseudo'))
+    pseudo.element = 'Ar'
+
+    def validate_md5(*_, **__):
+        raise AssertionError('the md5 should not be validated again')
+
+    monkeypatch.setattr(PseudoPotentialData, 'validate_md5', validate_md5)
+    assert pseudo.store().is_stored
+
+
+@pytest.mark.usefixtures('aiida_profile_clean')
+def test_store_explicit_md5():
+    """Test the `PseudoPotentialData.store` method validates an md5 that was passed explicitly to ``set_file``."""
+    pseudo = PseudoPotentialData(None)
+    pseudo.set_file(io.BytesIO(b'pseudo'), md5='abcdef0123456789')
+    pseudo.element = 'Ar'
+
+    with pytest.raises(StoringNotAllowed, match=r'md5 does not match that of stored file:'):
+        pseudo.store()
+
+    pseudo = PseudoPotentialData.get_or_create(io.BytesIO(b'pseudo'), md5='abcdef0123456789')
+    pseudo.element = 'Ar'
+
+    with pytest.raises(StoringNotAllowed, match=r'md5 does not match that of stored file:'):
+        pseudo.store()
+
+
 @pytest.mark.usefixtures('aiida_profile_clean')
 def test_element():
     """Test the `PseudoPotentialData.element` property."""
@@ -195,6 +302,11 @@ def test_get_or_create(get_pseudo_potential_data):
     assert duplicate.is_stored
     assert duplicate.uuid == original.uuid
 
+    # Passing a precomputed md5 checksum should return the same node.
+    stream.seek(0)
+    duplicate = PseudoPotentialData.get_or_create(stream, md5=original.md5)
+    assert duplicate.uuid == original.uuid
+
     # If the content is different, we should get a different node.
     stream.seek(0)
     different_content = PseudoPotentialData.get_or_create(io.BytesIO(b'different'))
@@ -211,6 +323,31 @@ def test_get_or_create(get_pseudo_potential_data):
     assert different_class.uuid != original.uuid
 
 
+@pytest.mark.usefixtures('aiida_profile_clean')
+def test_get_or_create_md5_once(monkeypatch):
+    """Test that ``PseudoPotentialData.get_or_create`` computes the md5 of the content of a new node just once."""
+    from aiida_pseudo.data.pseudo import pseudo as module
+
+    content = b'content'
+    streams = []
+
+    def md5_from_stream_counted(stream):
+        streams.append(stream)
+        return md5_from_stream(stream)
+
+    monkeypatch.setattr(module, 'md5_from_stream', md5_from_stream_counted)
+
+    node = PseudoPotentialData.get_or_create(io.BytesIO(content))
+    assert not node.is_stored
+    assert node.md5 == md5_from_filelike(io.BytesIO(content))
+    assert len(streams) == 1
+
+    streams.clear()
+    node = PseudoPotentialData.get_or_create(io.BytesIO(content), md5=node.md5)
+    assert node.md5 == md5_from_filelike(io.BytesIO(content))
+    assert len(streams) == 0
+
+
 @pytest.mark.parametrize(
     'stream, filename, element, are_equal',
     (
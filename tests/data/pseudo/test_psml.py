@@ -5,6 +5,7 @@ import pathlib
 import pytest
 from aiida.common.exceptions import ModificationNotAllowed
 from aiida_pseudo.data.pseudo import PsmlData
+from aiida_pseudo.data.pseudo.psml import parse_attributes, parse_element, parse_z_valence
 
 
 @pytest.fixture
@@ -61,3 +62,75 @@ def test_set_file(filepath_pseudos, get_pseudo_potential_data):
 
         with pytest.raises(ModificationNotAllowed):
             pseudo.set_file(handle)
+
+
+@pytest.mark.parametrize(
+    'content',
+    (
+        b'<psml><pseudo-atom-spec note="a>b" atomic-label="Ba" z-pseudo="10"/></psml>',
+        b'<psml><!-- <pseudo-atom-spec atomic-label="Xx" z-pseudo="1"> --><pseudo-atom-spec atomic-label="Ba" '
+        b'z-pseudo="10"/></psml>',
+        b'<psml><pseudo-atom-spec atomic-label="&#66;a" z-pseudo="10"/></psml>',
+    ),
+)
+def test_parse_tag_fast_path_fallback(content):
+    """Test the parsing of content for which the regular expression of the fast path is insufficient."""
+    assert parse_element(io.BytesIO(content)) == 'Ba'
+    assert parse_z_valence(io.BytesIO(content)) == 10
+
+
+@pytest.mark.parametrize('padding', (b'', b' ' * 8192))
+@pytest.mark.parametrize('tag', ('pseudo-atom-spec', 'psml:pseudo-atom-spec'))
+def test_parse_tag(padding, tag):
+    """Test the parsing of the ``pseudo-atom-spec`` tag, optionally with a namespace prefix.
+
+    With the padding, the tag is not in the head of the content that is searched with the regular expression, such
+    that the content has to be parsed as XML.
+    """
+    content = b'<psml xmlns:psml="urn:psml">' + padding + f'<{tag} atomic-label="ar" z-pseudo="8.0"/></psml>'.encode()
+    assert parse_element(io.BytesIO(content)) == 'Ar'
+    assert parse_z_valence(io.BytesIO(content)) == 8
+
+
+@pytest.mark.parametrize(
+    'content, message',
+    (
+        (b'<psml><pseudo-atom-spec', r'could not parse the PSML content: .*'),
+        (b'<psml></psml>', r'could not parse the PSML content: the `pseudo-atom-spec` tag is not defined.'),
+        (b'<psml><pseudo-atom-spec z-pseudo="8"/></psml>', r'could not parse the element from the PSML content: .*'),
+    ),
+)
+def test_parse_element_invalid(content, message):
+    """Test that ``parse_element`` raises a ``ValueError`` for invalid content."""
+    with pytest.raises(ValueError, match=message):
+        parse_element(io.BytesIO(content))
+
+
+def test_parse_z_valence_invalid():
+    """Test that ``parse_z_valence`` raises a ``ValueError`` if the ``z-pseudo`` attribute is missing."""
+    content = b'<psml><pseudo-atom-spec atomic-label="Ar"/></psml>'
+
+    with pytest.raises(ValueError, match=r'could not parse the Z valence from the PSML content: .*'):
+        parse_z_valence(io.BytesIO(content))
+
+
+@pytest.mark.parametrize(('element', 'z_valence'), (('Ar', 8), ('He', 2)))
+def test_parse_attributes(filepath_pseudos, element, z_valence):
+    """Test that ``parse_attributes`` returns the element and Z valence of the fixture pseudopotentials."""
+    with (filepath_pseudos('psml') / f'{element}.psml').open('rb') as handle:
+        assert parse_attributes(handle) == (element, z_valence)
+
+
+@pytest.mark.parametrize(
+    'z_pseudo, message',
+    (
+        ('8.5', r'parsed value for the Z valence `8.5` is not an integer.'),
+        ('eight', r'parsed value for the Z valence `eight` is not a valid number.'),
+    ),
+)
+def test_parse_attributes_invalid_z_valence(z_pseudo, message):
+    """Test that ``parse_attributes`` raises a ``ValueError`` if the Z valence is not a valid integer."""
+    content = f'<psml><pseudo-atom-spec atomic-label="Ar" z-pseudo="{z_pseudo}"/></psml>'.encode()
+
+    with pytest.raises(ValueError, match=message):
+        parse_attributes(io.BytesIO(content))
@@ -5,7 +5,7 @@ import pathlib
 import pytest
 from aiida.common.exceptions import ModificationNotAllowed
 from aiida_pseudo.data.pseudo import VpsData
-from aiida_pseudo.data.pseudo.vps import parse_xc_type, parse_z_valence
+from aiida_pseudo.data.pseudo.vps import parse_vps_header, parse_xc_type, parse_z_valence
 
 
 @pytest.fixture
@@ -79,3 +79,43 @@ def test_parse_z_valence(content):
 def test_parse_xc_type(content):
     """Test the ``parse_xc_type`` method."""
     assert parse_xc_type(content)
+
+
+@pytest.mark.parametrize('content_type', (str, bytes))
+def test_parse_vps_header(content_type):
+    """Test the ``parse_vps_header`` method."""
+    content = 'AtomSpecies 18\nxc.type GGA\nvalence.electron 8.0\n'
+
+    if content_type is bytes:
+        content = content.encode('utf-8')
+
+    assert parse_vps_header(content) == {'element': 'Ar', 'z_valence': 8, 'xc_type': 'GGA-PBE'}
+
+
+@pytest.mark.parametrize(
+    'content',
+    (
+        b'AtomSpecies 18\nxc.type GGA\nvalence.electron 8.0\n',
+        b'atomspecies\n18\nXC.TYPE GGA # LDA|GGA\nValence.Electron 8.0\n',
+        b'AtomSpecies 18\nxc.type GGA\nvalence.electron 8.0# comment\n',
+        b'AtomSpecies 18\nxc.type GGA\nvalence.electron 8.0',
+        b'AtomSpecies 18\nxc.type GGA\n' + b' ' * 64 + b'valence.electron 8.0\n',
+    ),
+)
+def test_parse_vps_header_literal_keys(content):
+    """Test the ``parse_vps_header`` method for contents where the keys may or may not be found as literals."""
+    assert parse_vps_header(content) == {'element': 'Ar', 'z_valence': 8, 'xc_type': 'GGA-PBE'}
+
+
+@pytest.mark.parametrize(
+    'content, message',
+    (
+        ('valence.electron 8.0\nxc.type LDA', 'could not parse the element'),
+        ('AtomSpecies 18\nxc.type LDA', 'could not parse the Z valence'),
+        ('AtomSpecies 18\nvalence.electron 8.0', 'could not parse the exchange-correlation type'),
+    ),
+)
+def test_parse_vps_header_missing(content, message):
+    """Test the ``parse_vps_header`` method raises if one of the fields is missing."""
+    with pytest.raises(ValueError, match=message):
+        parse_vps_header(content)
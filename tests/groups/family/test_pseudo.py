@@ -1,5 +1,7 @@
 """Tests for the `PseudoPotentialFamily` class."""
+import io
 import shutil
+import tarfile
 
 import pytest
 from aiida.common import exceptions
@@ -176,6 +178,55 @@ def test_create_from_folder_duplicate(filepath_pseudos):
         PseudoPotentialFamily.create_from_folder(filepath_pseudos(), label)
 
 
+@pytest.mark.usefixtures('aiida_profile_clean')
+def test_create_from_tar_stream(filepath_pseudos):
+    """Test the `PseudoPotentialFamily.create_from_tar_stream` class method."""
+    stream = io.BytesIO()
+
+    with tarfile.open(fileobj=stream, mode='w:gz') as archive:
+        archive.add(filepath_pseudos(), arcname='pseudos')
+
+    stream.seek(0)
+    label = 'label'
+    family = PseudoPotentialFamily.create_from_tar_stream(stream, label)
+
+    assert isinstance(family, PseudoPotentialFamily)
+    assert family.is_stored
+    assert family.label == label
+    assert len(family.nodes) == len(list(filepath_pseudos().iterdir()))
+
+
+def test_parse_pseudos_from_tar_stream_non_file(filepath_pseudos):
+    """Test the `PseudoPotentialFamily.parse_pseudos_from_tar_stream` class method for an archive with a non-file."""
+    stream = io.BytesIO()
+
+    with tarfile.open(fileobj=stream, mode='w') as archive:
+        archive.add(filepath_pseudos() / 'Ar.upf', arcname='Ar.upf')
+        symlink = tarfile.TarInfo('He.upf')
+        symlink.type = tarfile.SYMTYPE
+        symlink.linkname = 'Ar.upf'
+        archive.addfile(symlink)
+
+    stream.seek(0)
+
+    with pytest.raises(ValueError, match=r'the archive contains at least one entry that is not a file: He.upf'):
+        PseudoPotentialFamily.parse_pseudos_from_tar_stream(stream, deduplicate=False)
+
+
+def test_parse_pseudos_from_tar_stream_multiple_directories(filepath_pseudos):
+    """Test the `PseudoPotentialFamily.parse_pseudos_from_tar_stream` class method for files in multiple directories."""
+    stream = io.BytesIO()
+
+    with tarfile.open(fileobj=stream, mode='w') as archive:
+        archive.add(filepath_pseudos() / 'Ar.upf', arcname='Ar.upf')
+        archive.add(filepath_pseudos() / 'He.upf', arcname='directory/He.upf')
+
+    stream.seek(0)
+
+    with pytest.raises(ValueError, match=r'the archive contains files in more than one directory: `.` and `directory`'):
+        PseudoPotentialFamily.parse_pseudos_from_tar_stream(stream, deduplicate=False)
+
+
 def test_parse_pseudos_from_directory_non_file(tmp_path):
     """Test the `PseudoPotentialFamily.parse_pseudos_from_directory` class method for folder containing a non-file.
 
@@ -313,6 +364,18 @@ def test_add_nodes_duplicate_element(get_pseudo_family, get_pseudo_potential_dat
         family.add_nodes(pseudo)
 
 
+@pytest.mark.usefixtures('aiida_profile_clean')
+def test_add_nodes_duplicate_element_in_nodes(get_pseudo_family, get_pseudo_potential_data):
+    """Test that `PseudoPotentialFamily.add_nodes` fails if the nodes contain multiple pseudos for the same element."""
+    family = get_pseudo_family(elements=('He',))
+    pseudos = [get_pseudo_potential_data('Ar').store(), get_pseudo_potential_data('Ar').store()]
+
+    with pytest.raises(ValueError, match='the nodes contain more than one pseudo potential for element `Ar`'):
+        family.add_nodes(pseudos)
+
+    assert family.count() == 1
+
+
 @pytest.mark.usefixtures('aiida_profile_clean')
 def test_remove_nodes(get_pseudo_family):
     """Test the ``PseudoPotentialFamily.remove_nodes`` method."""
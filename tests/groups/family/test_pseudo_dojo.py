@@ -1,4 +1,8 @@
 """Tests for the `PseudoDojoFamily` class."""
+import io
+import json
+import tarfile
+
 import pytest
 from aiida_pseudo.data.pseudo import JthXmlData, PsmlData, Psp8Data, UpfData
 from aiida_pseudo.groups.family import PseudoDojoConfiguration, PseudoDojoFamily
@@ -36,6 +40,9 @@ def test_get_valid_labels():
     for entry in valid_labels:
         assert isinstance(entry, str)
 
+    configurations = PseudoDojoFamily.valid_configurations
+    assert valid_labels == tuple(PseudoDojoFamily.format_configuration_label(entry) for entry in configurations)
+
 
 def test_format_configuration_label():
     """Test the `PseudoDojoFamily.format_configuration_label` class method."""
@@ -73,3 +80,48 @@ def test_create_from_folder_duplicate(filepath_pseudos):
 
     with pytest.raises(ValueError, match=r'the PseudoDojoFamily `.*` already exists'):
         PseudoDojoFamily.create_from_folder(filepath_pseudos('upf'), label)
+
+
+def test_parse_djrepos_from_tar_stream():
+    """Test the `PseudoDojoFamily.parse_djrepos_from_tar_stream` class method."""
+    stream = io.BytesIO()
+    hints = {'low': {'ecut': 10.0}, 'normal': {'ecut': 20.0}, 'high': {'ecut': 30.0}}
+
+    with tarfile.open(fileobj=stream, mode='w:gz') as archive:
+        for name, content in (
+            ('djrepos/Ar.djrepo', json.dumps({'hints': hints, 'md5': 'md5_ar'}).encode('utf-8')),
+            ('djrepos/He.djrepo', json.dumps({'hints': hints, 'md5': 'md5_he'}).encode('utf-8')),
+            ('djrepos/README', b'extraneous'),
+        ):
+            info = tarfile.TarInfo(name)
+            info.size = len(content)
+            archive.addfile(info, io.BytesIO(content))
+
+    stream.seek(0)
+
+    with pytest.warns(UserWarning, match=r'filename README does not have a supported extension'):
+        md5s, cutoffs = PseudoDojoFamily.parse_djrepos_from_tar_stream(stream, pseudo_type=JthXmlData)
+
+    assert md5s == {'Ar': 'md5_ar', 'He': 'md5_he'}
+    assert cutoffs['normal'] == {
+        'Ar': {'cutoff_wfc': 20.0, 'cutoff_rho': 40.0},
+        'He': {'cutoff_wfc': 20.0, 'cutoff_rho': 40.0},
+    }
+
+
+def test_parse_djrepos_from_tar_stream_multiple_directories():
+    """Test the `PseudoDojoFamily.parse_djrepos_from_tar_stream` class method for files in multiple directories."""
+    stream = io.BytesIO()
+    hints = {'low': {'ecut': 10.0}, 'normal': {'ecut': 20.0}, 'high': {'ecut': 30.0}}
+    content = json.dumps({'hints': hints, 'md5': 'md5'}).encode('utf-8')
+
+    with tarfile.open(fileobj=stream, mode='w') as archive:
+        for name in ('Ar.djrepo', 'djrepos/He.djrepo'):
+            info = tarfile.TarInfo(name)
+            info.size = len(content)
+            archive.addfile(info, io.BytesIO(content))
+
+    stream.seek(0)
+
+    with pytest.raises(ValueError, match=r'the archive contains files in more than one directory: `.` and `djrepos`'):
+        PseudoDojoFamily.parse_djrepos_from_tar_stream(stream, pseudo_type=JthXmlData)
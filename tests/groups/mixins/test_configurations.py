@@ -0,0 +1,28 @@
+"""Tests for the :mod:`aiida_pseudo.groups.mixins.configurations` module."""
+from aiida_pseudo.groups.mixins import ConfigurationLabelsMixin
+
+
+class Family(ConfigurationLabelsMixin):
+    """Class using the ``ConfigurationLabelsMixin`` for testing purposes."""
+
+    valid_configurations = ('a', 'b', 'a')
+
+    @classmethod
+    def format_configuration_label(cls, configuration):
+        """Format the label of the configuration."""
+        return f'Family/{configuration}'
+
+
+class SubFamily(Family):
+    """Subclass of ``Family`` with other valid configurations."""
+
+    valid_configurations = ('c',)
+
+
+def test_get_valid_labels():
+    """Test the ``ConfigurationLabelsMixin.get_valid_labels`` method."""
+    assert Family.get_valid_labels() == ('Family/a', 'Family/b')
+    assert Family.get_valid_labels() is Family.get_valid_labels()
+    assert SubFamily.get_valid_labels() == ('Family/c',)
+    assert Family._get_valid_labels_set() == frozenset({'Family/a', 'Family/b'})
+    assert SubFamily._get_valid_labels_set() == frozenset({'Family/c'})
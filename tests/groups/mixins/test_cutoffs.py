@@ -16,6 +16,56 @@ def test_get_cutoffs_dict(get_pseudo_family, generate_cutoffs_dict):
     assert family._get_cutoffs_dict() == generate_cutoffs_dict(family)
 
 
+@pytest.mark.usefixtures('aiida_profile_clean')
+def test_get_cutoffs_dict_cache(get_pseudo_family, generate_cutoffs_dict):
+    """Test the ``CutoffsPseudoPotentialFamily._get_cutoffs_dict`` method caches the extra until it is changed."""
+    family = get_pseudo_family(cls=CutoffsPseudoPotentialFamily)
+    cutoffs_dict = generate_cutoffs_dict(family, ('low', 'normal'))
+
+    family.set_cutoffs(cutoffs_dict['low'], 'low')
+    assert family._get_cutoffs_dict() is family._get_cutoffs_dict()
+
+    family.set_cutoffs(cutoffs_dict['normal'], 'normal')
+    assert family._get_cutoffs_dict() == cutoffs_dict
+
+    with pytest.warns(UserWarning, match='`low` was the default stringency of this family.'):
+        family.delete_cutoffs('low')
+    assert family._get_cutoffs_dict() == {'normal': cutoffs_dict['normal']}
+    assert family._get_cutoffs_unit_dict() == {'normal': CutoffsPseudoPotentialFamily.DEFAULT_UNIT}
+
+
+@pytest.mark.usefixtures('aiida_profile_clean')
+def test_get_cutoffs_copy(get_pseudo_family, generate_cutoffs):
+    """Test that modifying the cutoffs returned by ``get_cutoffs`` does not affect the family."""
+    family = get_pseudo_family(cls=CutoffsPseudoPotentialFamily, elements=['Ar'])
+    cutoffs = generate_cutoffs(family)
+    family.set_cutoffs(cutoffs, 'normal')
+
+    family.get_cutoffs()['Ar']['cutoff_wfc'] = 100.0
+    family.get_cutoffs()['Kr'] = {'cutoff_wfc': 100.0, 'cutoff_rho': 200.0}
+
+    assert family.get_cutoffs() == cutoffs
+    assert family.get_recommended_cutoffs(elements='Ar') == (1.0, 2.0)
+
+    family.set_cutoffs(cutoffs, 'high')
+    assert family.base.extras.get(family._key_cutoffs) == {'normal': cutoffs, 'high': cutoffs}
+
+
+@pytest.mark.usefixtures('aiida_profile_clean')
+def test_get_cutoffs_by_key(get_pseudo_family, generate_cutoffs):
+    """Test the ``CutoffsPseudoPotentialFamily._get_cutoffs_by_key`` method is reset when the cutoffs are changed."""
+    family = get_pseudo_family(cls=CutoffsPseudoPotentialFamily, elements=['Ar'])
+    cutoffs = generate_cutoffs(family)
+
+    family.set_cutoffs(cutoffs, 'normal')
+    assert family._get_cutoffs_by_key('normal') == ({'Ar': 1.0}, {'Ar': 2.0})
+    assert family.get_recommended_cutoffs(elements='Ar') == (1.0, 2.0)
+
+    family.set_cutoffs({'Ar': {'cutoff_wfc': 3.0, 'cutoff_rho': 4.0}}, 'normal')
+    assert family._get_cutoffs_by_key('normal') == ({'Ar': 3.0}, {'Ar': 4.0})
+    assert family.get_recommended_cutoffs(elements='Ar') == (3.0, 4.0)
+
+
 @pytest.mark.usefixtures('aiida_profile_clean')
 def test_get_cutoffs_unit_dict(get_pseudo_family, generate_cutoffs_dict):
     """Test the ``CutoffsPseudoPotentialFamily._get_cutoffs_unit_dict`` method."""
@@ -61,6 +111,25 @@ def test_validate_stringency(get_pseudo_family, generate_cutoffs):
     family.validate_stringency(stringency)
 
 
+@pytest.mark.usefixtures('aiida_profile_clean')
+def test_resolve_stringency(get_pseudo_family, generate_cutoffs):
+    """Test the ``CutoffsPseudoPotentialFamily._resolve_stringency`` method."""
+    family = get_pseudo_family(cls=CutoffsPseudoPotentialFamily)
+
+    with pytest.raises(ValueError, match=r'no default stringency has been defined.'):
+        family._resolve_stringency(None)  # pylint: disable=protected-access
+
+    cutoffs = generate_cutoffs(family)
+    family.set_cutoffs(cutoffs, 'default')
+    family.set_cutoffs(cutoffs, 'high')
+
+    assert family._resolve_stringency(None) == 'default'  # pylint: disable=protected-access
+    assert family._resolve_stringency('high') == 'high'  # pylint: disable=protected-access
+
+    with pytest.raises(ValueError, match=r'stringency `.*` is not one of the available cutoff stringencies for this'):
+        family._resolve_stringency('non-existing')  # pylint: disable=protected-access
+
+
 @pytest.mark.usefixtures('aiida_profile_clean')
 def test_get_default_stringency(get_pseudo_family, generate_cutoffs):
     """Test the ``CutoffsPseudoPotentialFamily.get_default_stringency`` method."""
@@ -133,6 +202,11 @@ def test_set_cutoffs(get_pseudo_family, generate_cutoffs):
         cutoffs_invalid.pop('He')
         family.set_cutoffs(cutoffs_invalid, stringency)
 
+    with pytest.raises(ValueError, match=r'cutoffs defined for unsupported elements: .*'):
+        cutoffs_invalid = copy.deepcopy(cutoffs)
+        cutoffs_invalid['C'] = cutoffs_invalid.pop('He')
+        family.set_cutoffs(cutoffs_invalid, stringency)
+
     with pytest.raises(ValueError, match=r'invalid cutoff keys for element .*: .*'):
         cutoffs_invalid = copy.deepcopy(cutoffs)
         cutoffs_invalid['He'] = {'cutoff_wfc': 1.0}
@@ -282,6 +356,9 @@ def test_get_recommended_cutoffs_unit(get_pseudo_family, generate_cutoffs):
     expected = (cutoffs_ar['cutoff_wfc'] * 2, cutoffs_ar['cutoff_rho'] * 2)
     assert family.get_recommended_cutoffs(elements='Ar', unit='Ry') == expected
 
+    expected = (cutoffs_ar['cutoff_wfc'], cutoffs_ar['cutoff_rho'])
+    assert family.get_recommended_cutoffs(elements='Ar', unit=unit) == expected
+
 
 @pytest.mark.usefixtures('aiida_profile_clean')
 def test_get_cutoffs_unit(get_pseudo_family, generate_cutoffs):